@@ -3,8 +3,26 @@
 MongoDB utility module for updating school topics.
 
 This module provides functions to update topic information for schools
-stored in MongoDB collections.
+stored in MongoDB collections, either by replacing the whole topics array
+or by applying set-semantics deltas ($addToSet / $pull) that only write the
+topics that changed. Every write also sets 'updated_at' on the documents
+it changes, so that live subscriptions can poll for them; the filters
+exclude documents that a delta would leave unchanged, which therefore keep
+their stamp.
 """
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Mapping, Optional
+from pymongo import UpdateMany
+
+
+def _stamp() -> Dict[str, datetime]:
+    """Return the $set document recording the time of a write."""
+    return {'updated_at': datetime.now(timezone.utc)}
+
+
+def _add_filter(name: str, topics: List[str]) -> Dict:
+    """Match the schools named name still missing one of topics."""
+    return {'name': name, 'topics': {'$not': {'$all': topics}}}
 
 
 def update_topics(mongo_collection, name, topics):
@@ -24,5 +42,117 @@ def update_topics(mongo_collection, name, topics):
     """
     mongo_collection.update_many(
         {'name': name},
-        {'$set': {'topics': topics}}
+        {'$set': {'topics': topics, **_stamp()}}
+    )
+
+
+def add_topics(mongo_collection, name: str, topics: List[str]) -> int:
+    """
+    Add topics to the schools with the given name, skipping duplicates.
+
+    Only the added topics are sent and concurrent writers cannot overwrite
+    each other's additions, unlike a full-array $set.
+
+    Args:
+        mongo_collection: A MongoDB collection object containing schools
+        name (str): The name of the school to update
+        topics (list): The topics to add
+
+    Returns:
+        int: The number of documents actually modified
+    """
+    topics = list(topics)
+    if not topics:
+        return 0
+    result = mongo_collection.update_many(
+        _add_filter(name, topics),
+        {'$addToSet': {'topics': {'$each': topics}}, '$set': _stamp()}
+    )
+
+    return result.modified_count
+
+
+def remove_topics(mongo_collection, name: str, topics: List[str]) -> int:
+    """
+    Remove topics from the schools with the given name.
+
+    Args:
+        mongo_collection: A MongoDB collection object containing schools
+        name (str): The name of the school to update
+        topics (list): The topics to remove
+
+    Returns:
+        int: The number of documents actually modified
+    """
+    topics = list(topics)
+    result = mongo_collection.update_many(
+        {'name': name, 'topics': {'$in': topics}},
+        {'$pull': {'topics': {'$in': topics}}, '$set': _stamp()}
     )
+
+    return result.modified_count
+
+
+def replace_topics(mongo_collection, name: str, topics: List[str]) -> int:
+    """
+    Replace the topics of the schools with the given name.
+
+    Unlike update_topics, schools whose topics already equal the new list
+    are filtered out server side, so they are not rewritten and their
+    topic index entries are left untouched.
+
+    Args:
+        mongo_collection: A MongoDB collection object containing schools
+        name (str): The name of the school to update
+        topics (list): The new list of topics
+
+    Returns:
+        int: The number of documents actually modified
+    """
+    topics = list(topics)
+    result = mongo_collection.update_many(
+        {'name': name, 'topics': {'$ne': topics}},
+        {'$set': {'topics': topics, **_stamp()}}
+    )
+
+    return result.modified_count
+
+
+def bulk_update_topics(mongo_collection,
+                       deltas: Iterable[Mapping]) -> Optional[object]:
+    """
+    Apply the topic deltas of many schools in a single bulk_write.
+
+    Each delta is a mapping with a 'name' key and optional 'add' and
+    'remove' topic lists. $addToSet and $pull cannot target the same field
+    in one update, so each delta becomes up to two UpdateMany operations,
+    applied in order.
+
+    Args:
+        mongo_collection: A MongoDB collection object containing schools
+        deltas: The deltas, e.g. {'name': "UCSF", 'add': ["Python"]}
+
+    Returns:
+        BulkWriteResult: The result of the bulk write, or None when there
+        was nothing to write
+    """
+    operations = []
+    stamp = _stamp()
+    for delta in deltas:
+        added = list(delta.get('add', ()))
+        removed = list(delta.get('remove', ()))
+        if added:
+            operations.append(UpdateMany(
+                _add_filter(delta['name'], added),
+                {'$addToSet': {'topics': {'$each': added}}, '$set': stamp}
+            ))
+        if removed:
+            operations.append(UpdateMany(
+                {'name': delta['name'], 'topics': {'$in': removed}},
+                {'$pull': {'topics': {'$in': removed}}, '$set': stamp}
+            ))
+
+    if not operations:
+        return None
+
+    return mongo_collection.bulk_write(operations, ordered=True)
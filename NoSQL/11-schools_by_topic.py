@@ -4,18 +4,44 @@ MongoDB Python module for finding schools by topic
 This module provides a function to query MongoDB for schools
 that have a specific topic in their curriculum.
 """
+from typing import Any, List, Optional, Sequence
 
 
-def schools_by_topic(mongo_collection, topic):
+def schools_by_topic(mongo_collection, topic: str,
+                     fields: Optional[Sequence[str]] = None,
+                     as_tuples: bool = False, raw: bool = False) -> List[Any]:
     """
     Returns a list of schools that have a specific topic.
 
     Args:
         mongo_collection: A pymongo collection object
         topic (str): The topic to search for in the schools
+        fields (Sequence[str], optional): Fields to project, e.g.
+        ('_id', 'name'); full documents are returned when None. '_id' is
+        excluded unless listed
+        as_tuples (bool): Return (value, ...) tuples in fields order
+        (None for a missing field); requires fields
+        raw (bool): Return lazily decoded RawBSONDocument objects
 
     Returns:
         list: A list of school documents that contain the specified topic
               in their 'topics' field
     """
-    return list(mongo_collection.find({"topics": topic}))
+    assert not (as_tuples and raw), "as_tuples and raw are exclusive"
+    assert not as_tuples or fields is not None, "as_tuples requires fields"
+
+    projection = None
+    if fields is not None:
+        projection = {'_id': 0, **{field: 1 for field in fields}}
+    if raw:
+        from bson.codec_options import CodecOptions
+        from bson.raw_bson import RawBSONDocument
+        mongo_collection = mongo_collection.with_options(
+            codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
+
+    cursor = mongo_collection.find({"topics": topic}, projection)
+    if as_tuples:
+        return [tuple(doc.get(field) for field in fields) for doc in cursor]
+
+    return list(cursor)
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Asynchronous MongoDB helpers for school and Nginx log collections.
+
+This module provides coroutine counterparts of list_all, insert_school,
+update_topics, schools_by_topic and log_stats that work with any collection
+following the small AsyncCollection protocol below (Motor collections, or
+the in-process FakeAsyncCollection), so asyncio services no longer need to
+push blocking pymongo calls onto threads. Like their blocking
+counterparts, the writes stamp the school documents with an 'updated_at'
+date.
+"""
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import (Any, Dict, Iterable, List, Mapping, Optional, Protocol,
+                    Set)
+
+
+METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+
+class AsyncCursor(Protocol):
+    """Minimal cursor interface returned by AsyncCollection.find."""
+
+    async def to_list(self, length: Optional[int]) -> List[Dict]:
+        """Drain the cursor into a list of documents."""
+        ...
+
+
+class AsyncCollection(Protocol):
+    """Minimal collection interface used by the async helpers.
+
+    Motor's AsyncIOMotorCollection satisfies it, and so does any fake
+    exposing the same coroutine methods.
+    """
+
+    def find(self, filter: Optional[Mapping] = None) -> AsyncCursor:
+        """Return a cursor over the documents matching filter."""
+        ...
+
+    async def insert_one(self, document: Mapping) -> Any:
+        """Insert one document, returning a result with inserted_id."""
+        ...
+
+    async def insert_many(self, documents: List[Mapping],
+                          ordered: bool = True) -> Any:
+        """Insert documents, returning a result with inserted_ids."""
+        ...
+
+    async def update_many(self, filter: Mapping, update: Mapping) -> Any:
+        """Apply update to every document matching filter."""
+        ...
+
+    async def count_documents(self, filter: Mapping) -> int:
+        """Count the documents matching filter."""
+        ...
+
+
+class _FakeCursor:
+    """Cursor of FakeAsyncCollection over already matched documents."""
+
+    def __init__(self, owner: "FakeAsyncCollection",
+                 documents: List[Dict]) -> None:
+        """Wrap the matched documents."""
+        self.owner = owner
+        self.documents = documents
+
+    async def to_list(self, length: Optional[int]) -> List[Dict]:
+        """Return copies of up to length documents after one round trip."""
+        await self.owner._round_trip()
+        return [dict(document) for document in self.documents[:length]]
+
+
+class FakeAsyncCollection:
+    """In-process collection following the AsyncCollection protocol.
+
+    Documents live in a list and every call sleeps latency seconds, like a
+    round trip to a server, so the helpers can be exercised and their
+    concurrency measured without motor or a running mongod. Filters only
+    support equality on top-level fields (matching array elements like
+    MongoDB) and updates only $set.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Create an empty collection answering after latency seconds."""
+        self.latency = latency
+        self.documents: List[Dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._next_id = 0
+
+    async def _round_trip(self) -> None:
+        """Simulate the latency of one call, tracking concurrent calls."""
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+    def _matches(self, document: Mapping, filter: Mapping) -> bool:
+        """Tell whether document matches an equality filter."""
+        for field, value in filter.items():
+            current = document.get(field)
+            if current != value and not (isinstance(current, list) and
+                                         value in current):
+                return False
+        return True
+
+    def _insert(self, document: Mapping) -> Any:
+        """Store a copy of document, giving it an _id if it has none."""
+        document = dict(document)
+        if '_id' not in document:
+            self._next_id += 1
+            document['_id'] = self._next_id
+        self.documents.append(document)
+        return document['_id']
+
+    def find(self, filter: Optional[Mapping] = None) -> _FakeCursor:
+        """Return a cursor over the documents matching filter."""
+        return _FakeCursor(self, [document for document in self.documents
+                                  if self._matches(document, filter or {})])
+
+    async def insert_one(self, document: Mapping) -> Any:
+        """Insert one document, returning a result with inserted_id."""
+        await self._round_trip()
+        return SimpleNamespace(inserted_id=self._insert(document))
+
+    async def insert_many(self, documents: List[Mapping],
+                          ordered: bool = True) -> Any:
+        """Insert documents, returning a result with inserted_ids."""
+        await self._round_trip()
+        return SimpleNamespace(
+            inserted_ids=[self._insert(document) for document in documents])
+
+    async def update_many(self, filter: Mapping, update: Mapping) -> Any:
+        """Apply the $set of update to every document matching filter."""
+        await self._round_trip()
+        matched = [document for document in self.documents
+                   if self._matches(document, filter)]
+        for document in matched:
+            document.update(update.get('$set', {}))
+        return SimpleNamespace(matched_count=len(matched),
+                               modified_count=len(matched))
+
+    async def count_documents(self, filter: Mapping) -> int:
+        """Count the documents matching filter."""
+        await self._round_trip()
+        return sum(self._matches(document, filter)
+                   for document in self.documents)
+
+
+async def list_all_async(mongo_collection: AsyncCollection) -> List[Dict]:
+    """
+    Retrieve all documents from a collection without blocking the loop.
+
+    Args:
+        mongo_collection: A collection following the AsyncCollection protocol
+
+    Returns:
+        list: All documents in the collection, or an empty list
+    """
+    return await mongo_collection.find().to_list(None)
+
+
+async def insert_school_async(mongo_collection: AsyncCollection,
+                              **kwargs: Any) -> Any:
+    """
+    Insert a new school document built from the keyword arguments.
+
+    Args:
+        mongo_collection: A collection following the AsyncCollection protocol
+        **kwargs: Fields and values of the school document; 'updated_at'
+        defaults to the insertion time
+
+    Returns:
+        ObjectId: The ID of the newly inserted document
+    """
+    result = await mongo_collection.insert_one(
+        {'updated_at': datetime.now(timezone.utc), **kwargs})
+
+    return result.inserted_id
+
+
+async def update_topics_async(mongo_collection: AsyncCollection, name: str,
+                              topics: List[str]) -> None:
+    """
+    Replace the topics of every school document with the given name.
+
+    Args:
+        mongo_collection: A collection following the AsyncCollection protocol
+        name (str): The name of the school to update
+        topics (list): The new list of topics
+    """
+    await mongo_collection.update_many(
+        {'name': name},
+        {'$set': {'topics': topics,
+                  'updated_at': datetime.now(timezone.utc)}}
+    )
+
+
+async def schools_by_topic_async(mongo_collection: AsyncCollection,
+                                 topic: str) -> List[Dict]:
+    """
+    Return the school documents having a specific topic.
+
+    Args:
+        mongo_collection: A collection following the AsyncCollection protocol
+        topic (str): The topic to search for
+
+    Returns:
+        list: The school documents containing topic in their 'topics' field
+    """
+    return await mongo_collection.find({"topics": topic}).to_list(None)
+
+
+async def insert_schools_async(mongo_collection: AsyncCollection,
+                               schools: Iterable[Mapping],
+                               batch_size: int = 1000,
+                               max_in_flight: int = 4) -> List[Any]:
+    """
+    Insert many school documents as pipelined insert_many batches.
+
+    Batches are cut from schools as they are consumed and inserted while
+    the rest is still being read: once max_in_flight batches are pending,
+    reading waits for one of them to complete. The driver keeps several
+    round trips on the wire, and at most max_in_flight + 1 batches are
+    held in memory whatever the length of schools.
+
+    Args:
+        mongo_collection: A collection following the AsyncCollection protocol
+        schools: School documents to insert
+        batch_size (int): Number of documents per insert_many call
+        max_in_flight (int): Maximum number of batches awaited at once
+
+    Returns:
+        list: The inserted IDs, in the same order as schools
+    """
+    assert batch_size > 0 and max_in_flight > 0
+
+    async def insert_batch(batch: List[Mapping]) -> List[Any]:
+        """Stamp and insert one batch."""
+        stamp = datetime.now(timezone.utc)
+        for school in batch:
+            school.setdefault('updated_at', stamp)
+        result = await mongo_collection.insert_many(batch, ordered=False)
+        return list(result.inserted_ids)
+
+    tasks: List[asyncio.Future] = []
+    pending: Set[asyncio.Future] = set()
+
+    async def submit(batch: List[Mapping]) -> None:
+        """Start a batch, first waiting for a free slot if needed."""
+        nonlocal pending
+        while len(pending) >= max_in_flight:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        task = asyncio.ensure_future(insert_batch(batch))
+        tasks.append(task)
+        pending.add(task)
+
+    try:
+        batch: List[Mapping] = []
+        for school in schools:
+            batch.append(dict(school))
+            if len(batch) == batch_size:
+                await submit(batch)
+                batch = []
+        if batch:
+            await submit(batch)
+        await asyncio.gather(*pending)
+    finally:
+        for task in pending:
+            task.cancel()
+
+    ids: List[Any] = []
+    for task in tasks:
+        ids.extend(task.result())
+
+    return ids
+
+
+async def update_topics_many_async(mongo_collection: AsyncCollection,
+                                   updates: Mapping[str, List[str]],
+                                   max_in_flight: int = 8) -> None:
+    """
+    Replace the topics of many schools with concurrent update calls.
+
+    Args:
+        mongo_collection: A collection following the AsyncCollection protocol
+        updates: Mapping of school name to its new list of topics
+        max_in_flight (int): Maximum number of updates awaited at once
+    """
+    assert max_in_flight > 0
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def update(name: str, topics: List[str]) -> None:
+        """Update one school once a pipeline slot is free."""
+        async with semaphore:
+            await update_topics_async(mongo_collection, name, topics)
+
+    await asyncio.gather(*(update(name, topics)
+                           for name, topics in updates.items()))
+
+
+async def collect_log_stats(logs_collection: AsyncCollection) -> Dict:
+    """
+    Count Nginx log documents with every count_documents issued at once.
+
+    The total, the five per-method counts and the status check count are
+    independent queries, so they are awaited together with asyncio.gather
+    and the whole report costs one round trip of latency instead of seven.
+
+    Args:
+        logs_collection: The logs.nginx collection
+
+    Returns:
+        dict: 'total', 'methods' (method -> count) and 'status_check'
+    """
+    queries = [{}]
+    queries.extend({"method": method} for method in METHODS)
+    queries.append({"method": "GET", "path": "/status"})
+
+    counts = await asyncio.gather(
+        *(logs_collection.count_documents(query) for query in queries)
+    )
+
+    return {
+        "total": counts[0],
+        "methods": dict(zip(METHODS, counts[1:-1])),
+        "status_check": counts[-1]
+    }
+
+
+async def log_stats_async(logs_collection: AsyncCollection) -> None:
+    """
+    Display the same Nginx log statistics as log_stats, asynchronously.
+
+    Args:
+        logs_collection: The logs.nginx collection
+    """
+    stats = await collect_log_stats(logs_collection)
+
+    print(f"{stats['total']} logs")
+    print("Methods:")
+    for method, count in stats["methods"].items():
+        print(f"\tmethod {method}: {count}")
+    print(f"{stats['status_check']} status check")
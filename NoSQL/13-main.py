@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+""" 13-main """
+import asyncio
+import time
+helpers = __import__('13-async_helpers')
+
+
+def schools(n, read):
+    for i in range(n):
+        read.append(time.perf_counter())
+        yield {'name': "School {}".format(i), 'topics': ["C", "Python"]}
+
+
+async def main():
+    school_collection = helpers.FakeAsyncCollection(latency=0.01)
+
+    await helpers.insert_schools_async(school_collection, [
+        {'name': "UCLA", 'topics': ["C", "Python"]},
+        {'name': "UCSD", 'topics': ["Cassandra"]}
+    ])
+    await helpers.update_topics_async(school_collection, "UCSD", ["Python"])
+
+    found = await helpers.schools_by_topic_async(school_collection,
+                                                 "Python")
+    for school in found:
+        print("[{}] {} {}".format(school.get('_id'), school.get('name'),
+                                  school.get('topics', "")))
+
+    read = []
+    start = time.perf_counter()
+    ids = await helpers.insert_schools_async(
+        school_collection, schools(10000, read), batch_size=500,
+        max_in_flight=4)
+    print("{} schools in {:.3f} s, last one read after {:.3f} s, "
+          "{} batches in flight at most".format(
+              len(ids), time.perf_counter() - start, read[-1] - start,
+              school_collection.max_in_flight))
+
+    logs = helpers.FakeAsyncCollection(latency=0.01)
+    for method in ("GET", "GET", "POST"):
+        await logs.insert_one({'method': method, 'path': "/status"})
+    start = time.perf_counter()
+    await helpers.log_stats_async(logs)
+    print("log stats in {:.3f} s".format(time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Time-bucketed rollups of the Nginx logs stored in MongoDB.
+
+This module summarizes logs.nginx into per-minute and per-hour bucket
+documents (request counts, methods, status codes, status checks, approximate
+top paths and IPs with Space-Saving, distinct IPs with HyperLogLog). Rollups
+are built incrementally from a high-water mark on '_id', and window queries
+merge a few hundred buckets instead of scanning millions of raw logs.
+
+The high-water mark assumes '_id' values increase with insertion order,
+as ObjectIds generated by a single client or server clock do: a log
+inserted with a smaller '_id' than the mark is never rolled up. Every
+bucket also stores the '_id' of the last log it accounts, so logs re-read
+after an interrupted flush are not counted twice.
+"""
+import hashlib
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from pymongo import ReplaceOne
+
+
+UNITS = {"minute": 60, "hour": 3600, "day": 86400}
+HIGH_WATER_MARK_ID = "__high_water_mark__"
+
+
+class SpaceSaving:
+    """Approximate top-k counter (Metwally et al. Space-Saving).
+
+    At most k items are tracked; each keeps a count and the maximum
+    over-estimation of that count. Summaries are mergeable, which lets
+    window queries combine per-bucket summaries.
+    """
+
+    def __init__(self, k: int = 50):
+        """Create an empty summary tracking at most k items."""
+        self.k = k
+        self.counters: Dict[Any, List[int]] = {}
+
+    def offer(self, item: Any, count: int = 1) -> None:
+        """Count count more occurrences of item."""
+        counter = self.counters.get(item)
+        if counter is not None:
+            counter[0] += count
+        elif len(self.counters) < self.k:
+            self.counters[item] = [count, 0]
+        else:
+            victim = min(self.counters, key=lambda i: self.counters[i][0])
+            floor = self.counters.pop(victim)[0]
+            self.counters[item] = [floor + count, floor]
+
+    def _floor(self) -> int:
+        """Return the count any untracked item may have reached."""
+        if len(self.counters) < self.k:
+            return 0
+        return min(counter[0] for counter in self.counters.values())
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Merge other into this summary and return it."""
+        floor, other_floor = self._floor(), other._floor()
+        merged = {}
+        for item in set(self.counters) | set(other.counters):
+            count, error = self.counters.get(item, (floor, floor))
+            other_count, other_error = other.counters.get(
+                item, (other_floor, other_floor))
+            merged[item] = [count + other_count, error + other_error]
+        top = sorted(merged.items(), key=lambda pair: -pair[1][0])
+        self.counters = dict(top[:self.k])
+
+        return self
+
+    def top(self, n: int) -> List[Tuple[Any, int, int]]:
+        """Return the n heaviest items as (item, count, error) tuples."""
+        ranked = sorted(self.counters.items(), key=lambda pair: -pair[1][0])
+        return [(item, count, error) for item, (count, error) in ranked[:n]]
+
+    def to_list(self) -> List[List]:
+        """Serialize the summary as [item, count, error] triples."""
+        return [[item, count, error]
+                for item, (count, error) in self.counters.items()]
+
+    @classmethod
+    def from_list(cls, triples: Iterable[Sequence], k: int) -> "SpaceSaving":
+        """Rebuild a summary serialized with to_list."""
+        summary = cls(k)
+        summary.counters = {item: [count, error]
+                            for item, count, error in triples}
+        return summary
+
+
+class HyperLogLog:
+    """Distinct-count sketch with 2 ** precision one-byte registers."""
+
+    def __init__(self, precision: int = 12,
+                 registers: Optional[bytes] = None):
+        """Create an empty sketch, or load it from serialized registers."""
+        self.precision = precision
+        size = 1 << precision
+        self.registers = bytearray(registers or size)
+        assert len(self.registers) == size, "register size mismatch"
+
+    def add(self, value: Any) -> None:
+        """Add the string form of value to the sketch."""
+        digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+        x = int.from_bytes(digest, "big")
+        bits = 64 - self.precision
+        index = x >> bits
+        rank = bits - (x & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Merge other into this sketch and return it."""
+        assert self.precision == other.precision, "precision mismatch"
+        self.registers = bytearray(
+            max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        """Return the estimated number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+
+class Bucket:
+    """Summary of the logs received during one time unit."""
+
+    def __init__(self, unit: str, start: datetime, top_k: int = 50,
+                 precision: int = 12):
+        """Create an empty bucket for the unit starting at start."""
+        self.unit = unit
+        self.start = start
+        self.top_k = top_k
+        self.count = 0
+        self.status_check = 0
+        self.methods: Dict[str, int] = {}
+        self.statuses: Dict[str, int] = {}
+        self.paths = SpaceSaving(top_k)
+        self.ips = SpaceSaving(top_k)
+        self.distinct_ips = HyperLogLog(precision)
+        self.last_id: Any = None
+
+    @property
+    def key(self) -> str:
+        """Return the '_id' of the bucket document."""
+        return "{}|{}".format(self.unit, self.start.isoformat())
+
+    def add(self, log: Dict) -> None:
+        """Account one log document."""
+        self.count += 1
+        method, path = log.get("method"), log.get("path")
+        if method is not None:
+            self.methods[method] = self.methods.get(method, 0) + 1
+        if log.get("status") is not None:
+            status = str(log["status"])
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        if method == "GET" and path == "/status":
+            self.status_check += 1
+        if path is not None:
+            self.paths.offer(path)
+        if log.get("ip") is not None:
+            self.ips.offer(log["ip"])
+            self.distinct_ips.add(log["ip"])
+
+    def merge(self, other: "Bucket") -> "Bucket":
+        """Merge other into this bucket and return it."""
+        self.count += other.count
+        self.status_check += other.status_check
+        for totals, extra in ((self.methods, other.methods),
+                              (self.statuses, other.statuses)):
+            for name, count in extra.items():
+                totals[name] = totals.get(name, 0) + count
+        self.paths.merge(other.paths)
+        self.ips.merge(other.ips)
+        self.distinct_ips.merge(other.distinct_ips)
+        if other.last_id is not None and (self.last_id is None or
+                                          other.last_id > self.last_id):
+            self.last_id = other.last_id
+
+        return self
+
+    def to_document(self) -> Dict:
+        """Serialize the bucket as a MongoDB document.
+
+        Counters are stored as [name, count] pairs because paths, methods
+        and IPs are not safe to use as field names.
+        """
+        return {
+            "_id": self.key,
+            "unit": self.unit,
+            "start": self.start,
+            "count": self.count,
+            "status_check": self.status_check,
+            "methods": [[k, v] for k, v in self.methods.items()],
+            "statuses": [[k, v] for k, v in self.statuses.items()],
+            "paths": self.paths.to_list(),
+            "ips": self.ips.to_list(),
+            "distinct_ips": bytes(self.distinct_ips.registers),
+            "last_id": self.last_id,
+        }
+
+    @classmethod
+    def from_document(cls, document: Dict, top_k: int = 50) -> "Bucket":
+        """Rebuild a bucket serialized with to_document."""
+        registers = bytes(document["distinct_ips"])
+        bucket = cls(document["unit"], document["start"], top_k,
+                     int(math.log2(len(registers))))
+        bucket.count = document["count"]
+        bucket.status_check = document["status_check"]
+        bucket.methods = {k: v for k, v in document["methods"]}
+        bucket.statuses = {k: v for k, v in document["statuses"]}
+        bucket.paths = SpaceSaving.from_list(document["paths"], top_k)
+        bucket.ips = SpaceSaving.from_list(document["ips"], top_k)
+        bucket.distinct_ips = HyperLogLog(bucket.distinct_ips.precision,
+                                          registers)
+        bucket.last_id = document.get("last_id")
+
+        return bucket
+
+
+def naive_utc(moment: datetime) -> datetime:
+    """Return moment as a naive UTC datetime, as pymongo stores them."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def floor_time(moment: datetime, unit: str) -> datetime:
+    """Return the naive UTC start of the unit containing moment."""
+    moment = naive_utc(moment)
+    seconds = UNITS[unit]
+    epoch = datetime(1970, 1, 1)
+    offset = int((moment - epoch).total_seconds()) // seconds * seconds
+
+    return epoch + timedelta(seconds=offset)
+
+
+def log_time(log: Dict, time_field: str = "date") -> datetime:
+    """Return the time of a log, falling back to its ObjectId timestamp."""
+    moment = log.get(time_field)
+    if isinstance(moment, datetime):
+        return moment
+    return log["_id"].generation_time
+
+
+class LogRollup:
+    """Incremental rollup engine over logs.nginx.
+
+    A single process is expected to call update(); queries can run
+    concurrently from anywhere.
+    """
+
+    def __init__(self, logs_collection, rollups_collection,
+                 units: Sequence[str] = ("minute", "hour"), top_k: int = 50,
+                 precision: int = 12, time_field: str = "date"):
+        """
+        Configure the engine.
+
+        Args:
+            logs_collection: The raw logs collection (logs.nginx)
+            rollups_collection: Collection holding the bucket documents
+            units (Sequence[str]): Bucket granularities to maintain
+            top_k (int): Items kept by every Space-Saving summary
+            precision (int): HyperLogLog precision (2 ** precision bytes)
+            time_field (str): Datetime field of the logs, the ObjectId
+            timestamp is used when it is missing
+        """
+        assert all(unit in UNITS for unit in units), "unknown unit"
+        self.logs = logs_collection
+        self.rollups = rollups_collection
+        self.units = tuple(units)
+        self.top_k = top_k
+        self.precision = precision
+        self.time_field = time_field
+
+    def ensure_indexes(self) -> None:
+        """Create the indexes window queries and update() rely on."""
+        self.rollups.create_index([("unit", 1), ("start", 1)])
+        self.rollups.create_index("last_id")
+
+    def high_water_mark(self) -> Any:
+        """Return the '_id' of the last log already rolled up, or None."""
+        meta = self.rollups.find_one({"_id": HIGH_WATER_MARK_ID})
+        return meta["last_id"] if meta else None
+
+    def update(self, batch_size: int = 50000) -> int:
+        """
+        Roll up the logs inserted since the high-water mark.
+
+        Logs are read in '_id' order and flushed every batch_size logs, each
+        flush merging the new partial buckets into the stored ones and then
+        advancing the high-water mark. When a previous flush was
+        interrupted, some stored buckets are ahead of the mark: the logs
+        they already account are skipped for them, whatever batch_size the
+        two runs used.
+
+        Args:
+            batch_size (int): Number of logs summarized between flushes
+
+        Returns:
+            int: The number of logs rolled up
+        """
+        last_id = self.high_water_mark()
+        query = {} if last_id is None else {"_id": {"$gt": last_id}}
+        applied = self._applied_ids(last_id)
+        cursor = self.logs.find(query).sort("_id", 1)
+
+        processed = 0
+        # Keyed by (unit, start): a Bucket, with its sketches, is only
+        # built for the first log of a time unit.
+        buckets: Dict[Tuple[str, datetime], Bucket] = {}
+        for log in cursor:
+            moment = log_time(log, self.time_field)
+            last_id = log["_id"]
+            for unit in self.units:
+                start = floor_time(moment, unit)
+                if (applied and (unit, start) in applied and
+                        last_id <= applied[unit, start]):
+                    continue
+                bucket = buckets.get((unit, start))
+                if bucket is None:
+                    bucket = buckets[unit, start] = Bucket(
+                        unit, start, self.top_k, self.precision)
+                bucket.add(log)
+                bucket.last_id = last_id
+            processed += 1
+            if processed % batch_size == 0:
+                self._flush(buckets.values(), last_id)
+                buckets = {}
+        if buckets:
+            self._flush(buckets.values(), last_id)
+
+        return processed
+
+    def _applied_ids(self, high_water_mark: Any) -> Dict[Tuple[str, datetime],
+                                                         Any]:
+        """Return the last log '_id' of the buckets ahead of the mark, by
+        (unit, start); empty unless a flush was interrupted."""
+        last_id: Dict = ({"$exists": True} if high_water_mark is None
+                         else {"$gt": high_water_mark})
+        return {(document["unit"], document["start"]): document["last_id"]
+                for document in self.rollups.find(
+                    {"_id": {"$ne": HIGH_WATER_MARK_ID}, "last_id": last_id},
+                    {"unit": 1, "start": 1, "last_id": 1})}
+
+    def _flush(self, partials: Iterable[Bucket], last_id: Any) -> None:
+        """
+        Merge partial buckets into the stored ones, then save last_id.
+
+        The bucket upserts and the high-water mark go in one ordered
+        bulk_write, the mark last. A bulk write is not a transaction: if it
+        stops midway, the buckets already written keep their own last_id,
+        which the next update() uses to avoid counting their logs again.
+        """
+        buckets = {bucket.key: bucket for bucket in partials}
+        stored = self.rollups.find({"_id": {"$in": list(buckets)}})
+        for document in stored:
+            key = document["_id"]
+            previous = Bucket.from_document(document, self.top_k)
+            buckets[key] = previous.merge(buckets[key])
+
+        operations = [
+            ReplaceOne({"_id": key}, bucket.to_document(), upsert=True)
+            for key, bucket in buckets.items()
+        ]
+        operations.append(ReplaceOne({"_id": HIGH_WATER_MARK_ID},
+                                     {"last_id": last_id}, upsert=True))
+        self.rollups.bulk_write(operations, ordered=True)
+
+    def query(self, start: datetime, end: datetime, unit: str = "hour",
+              top: int = 10) -> Dict:
+        """
+        Summarize the logs received in [start, end).
+
+        Args:
+            start (datetime): Window start, floored to unit
+            end (datetime): Window end, exclusive
+            unit (str): Bucket granularity to merge
+            top (int): Number of top paths and IPs to return
+
+        Returns:
+            dict: 'total', 'rate' (mean requests per unit), 'series'
+            ([start, count] per non-empty bucket), 'methods', 'statuses',
+            'status_check', 'top_paths' and 'top_ips' ([item, count, error]
+            triples) and 'distinct_ips' (estimate)
+        """
+        assert unit in self.units, "unit not rolled up"
+        window_start = floor_time(start, unit)
+        window_end = floor_time(end, unit)
+        if window_end < naive_utc(end):
+            window_end += timedelta(seconds=UNITS[unit])
+        documents = self.rollups.find({
+            "unit": unit,
+            "start": {"$gte": window_start, "$lt": window_end}
+        }).sort("start", 1)
+
+        total = Bucket(unit, window_start, self.top_k, self.precision)
+        series = []
+        for document in documents:
+            bucket = Bucket.from_document(document, self.top_k)
+            series.append([bucket.start, bucket.count])
+            total.merge(bucket)
+        units = max(1, int((window_end - window_start).total_seconds()
+                           // UNITS[unit]))
+
+        return {
+            "total": total.count,
+            "rate": total.count / units,
+            "series": series,
+            "methods": total.methods,
+            "statuses": total.statuses,
+            "status_check": total.status_check,
+            "top_paths": [list(t) for t in total.paths.top(top)],
+            "top_ips": [list(t) for t in total.ips.top(top)],
+            "distinct_ips": total.distinct_ips.count(),
+        }
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+""" 14-main """
+from datetime import datetime, timedelta
+from pymongo import MongoClient
+LogRollup = __import__('14-log_rollups').LogRollup
+
+if __name__ == "__main__":
+    client = MongoClient('mongodb://127.0.0.1:27017')
+    engine = LogRollup(client.logs.nginx, client.logs.nginx_rollups)
+    engine.ensure_indexes()
+    print("{} new logs rolled up".format(engine.update()))
+
+    end = datetime.utcnow()
+    stats = engine.query(end - timedelta(days=7), end, unit="hour", top=5)
+    print("{} logs, {:.1f} requests/hour".format(stats["total"],
+                                                 stats["rate"]))
+    print("Methods:")
+    for method, count in stats["methods"].items():
+        print("\tmethod {}: {}".format(method, count))
+    print("{} status check".format(stats["status_check"]))
+    print("Top paths:")
+    for path, count, error in stats["top_paths"]:
+        print("\t{}: {} (+/- {})".format(path, count, error))
+    print("Top IPs:")
+    for ip, count, error in stats["top_ips"]:
+        print("\t{}: {} (+/- {})".format(ip, count, error))
+    print("~{} distinct IPs".format(stats["distinct_ips"]))
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+""" 15-main """
+import io
+import os
+import random
+import tempfile
+from contextlib import redirect_stdout
+import bson
+from pymongo import MongoClient
+log_stats = __import__('12-log_stats').log_stats
+mod = __import__('15-offline_log_stats')
+offline_log_stats = mod.offline_log_stats
+print_stats = mod.print_stats
+
+if __name__ == "__main__":
+    random.seed(0)
+    logs = [{"ip": "10.0.0.{}".format(random.randint(1, 20)),
+             "method": random.choice(["GET", "GET", "POST", "PUT", "HEAD"]),
+             "path": random.choice(["/", "/status", "/login"])}
+            for _ in range(500)]
+
+    client = MongoClient('mongodb://127.0.0.1:27017')
+    client.logs.nginx.delete_many({})
+    client.logs.nginx.insert_many([dict(log) for log in logs])
+    expected = io.StringIO()
+    with redirect_stdout(expected):
+        log_stats()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "nginx.bson")
+        with open(path, "wb") as f:
+            for log in logs:
+                f.write(bson.encode(log))
+
+        for workers in (1, 2):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                print_stats(offline_log_stats(path, workers, 4096))
+            print("workers={}: {}".format(
+                workers, output.getvalue() == expected.getvalue()))
+        print(expected.getvalue(), end="")
+
+        with open(path, "ab") as f:
+            f.write(b"\x03\x00")
+        try:
+            offline_log_stats(path)
+        except ValueError as e:
+            print("ValueError: {}".format(e))
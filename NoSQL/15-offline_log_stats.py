@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Nginx log statistics computed offline from a mongodump BSON file.
+
+This script streams dump/logs/nginx.bson one document at a time (constant
+memory, no mongod needed), optionally spreading byte ranges of the file
+across a process pool, and prints the same report as 12-log_stats.py. The
+--extended flag adds status codes, top paths and IPs and distinct IPs.
+
+Usage: ./15-offline_log_stats.py [file] [--workers N] [--extended]
+"""
+import argparse
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+import bson
+Bucket = __import__('14-log_rollups').Bucket
+
+DUMP_FILE = "dump/logs/nginx.bson"
+METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+LENGTH = struct.Struct("<i")
+MIN_SIZE = 5
+
+
+def read_size(f, position: int) -> Optional[int]:
+    """
+    Read the length prefix of the BSON document starting at position.
+
+    Args:
+        f: Binary file positioned at the document
+        position (int): Offset of the document, used in error messages
+
+    Returns:
+        int: The total size of the document, None at end of file
+
+    Raises:
+        ValueError: If the prefix is truncated or too small to be a document
+    """
+    header = f.read(LENGTH.size)
+    if not header:
+        return None
+    if len(header) < LENGTH.size:
+        raise ValueError(f"truncated length header at offset {position}")
+    size = LENGTH.unpack(header)[0]
+    if size < MIN_SIZE:
+        raise ValueError(f"invalid document length {size} "
+                         f"at offset {position}")
+
+    return size
+
+
+def iter_documents(path: str, start: int = 0,
+                   end: Optional[int] = None) -> Iterator[dict]:
+    """
+    Decode the BSON documents stored between two offsets of a file.
+
+    Every BSON document starts with its little-endian int32 total length,
+    so documents are read and decoded one by one.
+
+    Args:
+        path (str): Path of the .bson file
+        start (int): Offset of the first document
+        end (int, optional): Offset where reading stops, None for EOF
+
+    Yields:
+        dict: The decoded documents
+
+    Raises:
+        ValueError: If the file ends in the middle of a document
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        while end is None or position < end:
+            size = read_size(f, position)
+            if size is None:
+                break
+            body = f.read(size - LENGTH.size)
+            if len(body) < size - LENGTH.size:
+                raise ValueError(f"truncated document at offset {position}")
+            yield bson.decode(LENGTH.pack(size) + body)
+            position += size
+
+
+def split_ranges(path: str, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """
+    Cut a .bson file into document-aligned ranges of about chunk_bytes.
+
+    Only the length prefixes are read, seeking over the document bodies.
+
+    Args:
+        path (str): Path of the .bson file
+        chunk_bytes (int): Target size of each range
+
+    Returns:
+        list: (start, end) offsets covering the whole file
+
+    Raises:
+        ValueError: If the file ends in the middle of a document
+    """
+    ranges = []
+    with open(path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        start = position = 0
+        while True:
+            size = read_size(f, position)
+            if size is None:
+                break
+            if position + size > file_size:
+                raise ValueError(f"truncated document at offset {position}")
+            position += size
+            f.seek(position)
+            if position - start >= chunk_bytes:
+                ranges.append((start, position))
+                start = position
+        if position > start:
+            ranges.append((start, position))
+
+    return ranges
+
+
+def summarize(path: str, start: int = 0, end: Optional[int] = None,
+              top_k: int = 50) -> Bucket:
+    """Summarize the logs stored between two offsets of a .bson file."""
+    summary = Bucket("all", datetime(1970, 1, 1), top_k)
+    for log in iter_documents(path, start, end):
+        summary.add(log)
+
+    return summary
+
+
+def offline_log_stats(path: str = DUMP_FILE, workers: int = 1,
+                      chunk_bytes: int = 1 << 22) -> Bucket:
+    """
+    Summarize every log of a nginx.bson dump.
+
+    Args:
+        path (str): Path of the .bson file
+        workers (int): Number of worker processes, 1 to stay in-process
+        chunk_bytes (int): Size of the ranges handed to the workers
+
+    Returns:
+        Bucket: The merged summary of the whole file
+    """
+    if workers <= 1:
+        return summarize(path)
+
+    ranges = split_ranges(path, chunk_bytes)
+    total = Bucket("all", datetime(1970, 1, 1))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(summarize, path, start, end)
+                   for start, end in ranges]
+        for future in futures:
+            total.merge(future.result())
+
+    return total
+
+
+def print_stats(summary: Bucket, extended: bool = False) -> None:
+    """Print a summary in the 12-log_stats.py format."""
+    print(f"{summary.count} logs")
+    print("Methods:")
+    for method in METHODS:
+        print(f"\tmethod {method}: {summary.methods.get(method, 0)}")
+    print(f"{summary.status_check} status check")
+
+    if not extended:
+        return
+    print("Status codes:")
+    for status, count in sorted(summary.statuses.items()):
+        print(f"\t{status}: {count}")
+    print("Top paths:")
+    for path, count, error in summary.paths.top(10):
+        print(f"\t{path}: {count} (+/- {error})")
+    print("IPs:")
+    for ip, count, error in summary.ips.top(10):
+        print(f"\t{ip}: {count} (+/- {error})")
+    print(f"~{summary.distinct_ips.count()} distinct IPs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("file", nargs="?", default=DUMP_FILE)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--extended", action="store_true")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.file):
+        parser.error(f"{args.file}: no such file, run mongodump first")
+    try:
+        summary = offline_log_stats(args.file, args.workers)
+    except ValueError as e:
+        parser.error(f"{args.file}: {e}")
+    print_stats(summary, args.extended)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Live pagination over MongoDB collections.
+
+A LiveQuery returns an initial page of the documents matching a query, like
+list_all or schools_by_topic, then keeps the client current with insert,
+update and delete deltas instead of letting it re-read the whole result
+set. Deltas come from a change stream when the server supports them
+(replica sets and sharded clusters). On a standalone server or mongomock,
+the query polls the 'updated_at' date that insert_school, update_topics
+and the topic delta functions stamp, and periodically re-reads a batch of
+the known ids to notice deletions.
+
+Either way, changed documents are re-read by _id with the subscribed
+query, so a document that stops matching it (for instance a school whose
+topic was removed) is reported as deleted, and one that starts matching as
+inserted.
+
+start() reads the _id and 'updated_at' of every matching document, which
+costs one pass over the result set on the server and memory for it on the
+client; subscribe with a selective (indexed) query on large collections.
+"""
+import time
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from pymongo.errors import OperationFailure
+build_projection = __import__('8-all').build_projection
+
+
+class LiveQuery:
+    """Subscription to the documents of a collection matching a query.
+
+    Example:
+        >>> with LiveQuery(school_collection, {"topics": "Python"},
+        ...                page_size=20) as live:
+        ...     page = live.start()
+        ...     for delta in live:
+        ...         print(delta["op"], delta["_id"])
+    """
+
+    def __init__(self, mongo_collection, query: Optional[Dict] = None,
+                 fields: Optional[Sequence[str]] = None,
+                 page_size: Optional[int] = None,
+                 poll_interval: float = 1.0, overlap: float = 5.0,
+                 delete_check_every: int = 10,
+                 delete_check_batch: int = 1000,
+                 change_stream: Optional[bool] = None):
+        """
+        Configure the subscription; nothing is read before start().
+
+        Args:
+            mongo_collection: A pymongo (or mongomock) collection
+            query (dict, optional): The filter of the subscribed documents
+            fields (Sequence[str], optional): Fields of the documents in the
+            page and deltas; '_id' and 'updated_at' are always included
+            page_size (int, optional): Size of the initial page (sorted by
+            _id), None for every matching document
+            poll_interval (float): Seconds to wait for changes per poll
+            overlap (float): Seconds re-read before the high-water mark when
+            polling, to tolerate clock skew between writers
+            delete_check_every (int): Polls between two deletion checks
+            delete_check_batch (int): Known ids re-read per deletion check
+            change_stream (bool, optional): Force (True) or forbid (False)
+            change streams, None to use them when available
+        """
+        assert delete_check_every > 0, "delete_check_every must be positive"
+        assert delete_check_batch > 0, "delete_check_batch must be positive"
+        self.collection = mongo_collection
+        self.query = query or {}
+        self.projection = build_projection(
+            None if fields is None else
+            list(fields) + ['_id', 'updated_at'])
+        self.page_size = page_size
+        self.poll_interval = poll_interval
+        self.overlap = timedelta(seconds=overlap)
+        self.delete_check_every = delete_check_every
+        self.delete_check_batch = delete_check_batch
+        self.change_stream = change_stream
+        self.mode: Optional[str] = None
+        self.known: Dict[Any, Any] = {}
+        self.high_water_mark = None
+        self.resume_token = None
+        self._stream = None
+        self._polls = 0
+        self._delete_offset = 0
+
+    def _open_stream(self) -> bool:
+        """Open the change stream, returning False when unsupported."""
+        if self.change_stream is False:
+            return False
+        if getattr(type(self.collection), 'watch', None) is None:
+            # mongomock collections have no watch method.
+            if self.change_stream:
+                raise OperationFailure(
+                    "change streams are not supported by this collection")
+            return False
+        try:
+            self._stream = self.collection.watch(
+                [{'$match': {'operationType': {'$in': [
+                    'insert', 'update', 'replace', 'delete']}}}],
+                max_await_time_ms=int(self.poll_interval * 1000),
+                resume_after=self.resume_token)
+        except OperationFailure:
+            # Standalone servers do not support change streams.
+            if self.change_stream:
+                raise
+            return False
+        return True
+
+    def _latest_stamp(self) -> Any:
+        """Return the most recent 'updated_at' of the collection."""
+        for document in self.collection.find(
+                {'updated_at': {'$exists': True}},
+                {'_id': 0, 'updated_at': 1}).sort('updated_at', -1).limit(1):
+            return document['updated_at']
+        return None
+
+    def start(self) -> List[Dict]:
+        """
+        Start following changes and return the initial page.
+
+        The change stream is opened, or the high-water mark read, before the
+        snapshot, so that no write is missed in between. The _id and
+        'updated_at' of every matching document are read to tell inserts
+        from updates later, so this scans the whole result set once.
+
+        Returns:
+            list: The first page_size matching documents, sorted by _id
+        """
+        self.mode = "change_stream" if self._open_stream() else "polling"
+        if self.mode == "polling":
+            self.high_water_mark = self._latest_stamp()
+        self.known = {document['_id']: document.get('updated_at')
+                      for document in self.collection.find(
+                          self.query, {'_id': 1, 'updated_at': 1})}
+        cursor = self.collection.find(self.query, self.projection).sort(
+            '_id', 1)
+        if self.page_size is not None:
+            cursor = cursor.limit(self.page_size)
+
+        return list(cursor)
+
+    def _refresh(self, ids: List[Any]) -> List[Dict]:
+        """Re-read changed documents and return the resulting deltas."""
+        if not ids:
+            return []
+        found = {document['_id']: document
+                 for document in self.collection.find(
+                     {'$and': [self.query, {'_id': {'$in': ids}}]},
+                     self.projection)}
+        deltas = []
+        for _id in ids:
+            document = found.get(_id)
+            if document is None:
+                if _id in self.known:
+                    del self.known[_id]
+                    deltas.append({'op': 'delete', '_id': _id,
+                                   'document': None})
+                continue
+            stamp = document.get('updated_at')
+            if _id not in self.known:
+                op = 'insert'
+            elif stamp is None or stamp != self.known[_id]:
+                op = 'update'
+            else:
+                continue
+            self.known[_id] = stamp
+            deltas.append({'op': op, '_id': _id, 'document': document})
+
+        return deltas
+
+    def _poll_stream(self) -> List[Dict]:
+        """Drain the available change events into deltas."""
+        changed: Dict[Any, None] = {}
+        deleted: List[Any] = []
+        change = self._stream.try_next()
+        while change is not None:
+            _id = change['documentKey']['_id']
+            if change['operationType'] == 'delete':
+                changed.pop(_id, None)
+                deleted.append(_id)
+            else:
+                changed[_id] = None
+            self.resume_token = self._stream.resume_token
+            change = self._stream.try_next()
+        deltas = []
+        for _id in deleted:
+            if _id in self.known and _id not in changed:
+                del self.known[_id]
+                deltas.append({'op': 'delete', '_id': _id, 'document': None})
+
+        return deltas + self._refresh(list(changed))
+
+    def _poll_stamps(self) -> List[Dict]:
+        """Read the documents stamped since the high-water mark."""
+        query = {'updated_at': {'$exists': True}}
+        if self.high_water_mark is not None:
+            query = {'updated_at': {'$gte': self.high_water_mark -
+                                    self.overlap}}
+        changed = []
+        for document in self.collection.find(query,
+                                             {'_id': 1, 'updated_at': 1}):
+            stamp = document['updated_at']
+            if (self.high_water_mark is None or
+                    stamp > self.high_water_mark):
+                self.high_water_mark = stamp
+            if (document['_id'] not in self.known or
+                    self.known[document['_id']] != stamp):
+                changed.append(document['_id'])
+        deltas = self._refresh(changed)
+
+        self._polls += 1
+        if self._polls % self.delete_check_every == 0:
+            deltas += self._refresh(self._delete_check_ids())
+        return deltas
+
+    def _delete_check_ids(self) -> List[Any]:
+        """
+        Return the next delete_check_batch known ids, round robin.
+
+        Re-reading them by _id bounds each deletion check to one batch
+        instead of the whole result set; every known id is checked within
+        about len(known) / delete_check_batch checks.
+        """
+        ids = list(self.known)
+        if self._delete_offset >= len(ids):
+            self._delete_offset = 0
+        batch = ids[self._delete_offset:
+                    self._delete_offset + self.delete_check_batch]
+        self._delete_offset += len(batch)
+        return batch
+
+    def poll(self) -> List[Dict]:
+        """
+        Return the deltas since the previous poll (possibly none).
+
+        Each delta is a dict with 'op' ('insert', 'update' or 'delete'),
+        '_id' and 'document' (None for deletions).
+        """
+        assert self.mode is not None, "start() must be called first"
+        if self.mode == "change_stream":
+            return self._poll_stream()
+        return self._poll_stamps()
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Yield deltas forever, waiting poll_interval between polls."""
+        while True:
+            deltas = self.poll()
+            yield from deltas
+            if self.mode == "polling" and not deltas:
+                time.sleep(self.poll_interval)
+
+    def close(self) -> None:
+        """Close the change stream, if any."""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def __enter__(self) -> "LiveQuery":
+        """Return the subscription."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the subscription."""
+        self.close()
+
+
+def live_schools_by_topic(mongo_collection, topic: str,
+                          **options: Any) -> LiveQuery:
+    """
+    Subscribe to the schools having a specific topic.
+
+    Args:
+        mongo_collection: A pymongo collection object
+        topic (str): The topic to follow
+        **options: Other LiveQuery arguments
+
+    Returns:
+        LiveQuery: The subscription, to start()
+    """
+    return LiveQuery(mongo_collection, {"topics": topic}, **options)
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+""" 16-main """
+from pymongo import MongoClient
+LiveQuery = __import__('16-live_pagination').LiveQuery
+insert_school = __import__('9-insert_school').insert_school
+remove_topics = __import__('10-update_topics').remove_topics
+
+if __name__ == "__main__":
+    client = MongoClient('mongodb://127.0.0.1:27017')
+    school_collection = client.my_db.school
+
+    with LiveQuery(school_collection, {"topics": "Python"}, fields=["name"],
+                   page_size=5, poll_interval=0.1) as live:
+        for school in live.start():
+            print("[{}] {}".format(school.get('_id'), school.get('name')))
+        print("mode: {}".format(live.mode))
+
+        school_id = insert_school(school_collection, name="Live school",
+                                  topics=["Python"])
+        delta = next(iter(live))
+        print("{} [{}] {}".format(delta['op'], delta['_id'],
+                                  delta['document'].get('name')))
+
+        # The school leaves the subscribed result set.
+        remove_topics(school_collection, "Live school", ["Python"])
+        delta = next(iter(live))
+        print("{} [{}]".format(delta['op'], delta['_id']))
+
+    school_collection.delete_one({'_id': school_id})
@@ -3,11 +3,72 @@
 MongoDB utility module for retrieving documents from collections.
 
 This module provides functions to interact with MongoDB collections
-and retrieve documents in a standardized format.
+and retrieve documents in a standardized format, optionally restricted to
+a projection of fields so that only those cross the wire and get decoded.
 """
+from typing import Any, Dict, List, Optional, Sequence
 
 
-def list_all(mongo_collection):
+def build_projection(fields: Optional[Sequence[str]]) -> Optional[Dict]:
+    """
+    Build a MongoDB projection that returns only the given fields.
+
+    The '_id' field is returned by MongoDB unless explicitly excluded, so
+    it is excluded whenever it is not part of fields.
+
+    Args:
+        fields (Sequence[str], optional): Names of the fields to return, or
+        None for full documents
+
+    Returns:
+        dict: The projection document, or None when fields is None
+    """
+    if fields is None:
+        return None
+    projection = {field: 1 for field in fields}
+    if '_id' not in projection:
+        projection['_id'] = 0
+
+    return projection
+
+
+def find_documents(mongo_collection, query: Dict,
+                   fields: Optional[Sequence[str]] = None,
+                   as_tuples: bool = False, raw: bool = False) -> List[Any]:
+    """
+    Run a find query with an optional projection and lean result types.
+
+    Args:
+        mongo_collection: A MongoDB collection object to query
+        query (dict): The query filter
+        fields (Sequence[str], optional): Fields to project, None for all
+        as_tuples (bool): Return one tuple per document, holding the values
+        of fields in order (None for a missing field); requires fields
+        raw (bool): Return undecoded bson.raw_bson.RawBSONDocument objects,
+        whose fields are only decoded when accessed
+
+    Returns:
+        list: The matching documents as dicts, tuples or raw BSON documents
+    """
+    assert not (as_tuples and raw), "as_tuples and raw are exclusive"
+    assert not as_tuples or fields is not None, "as_tuples requires fields"
+
+    if raw:
+        from bson.codec_options import CodecOptions
+        from bson.raw_bson import RawBSONDocument
+        mongo_collection = mongo_collection.with_options(
+            codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
+
+    cursor = mongo_collection.find(query, build_projection(fields))
+    if as_tuples:
+        return [tuple(doc.get(field) for field in fields) for doc in cursor]
+
+    return list(cursor)
+
+
+def list_all(mongo_collection, fields: Optional[Sequence[str]] = None,
+             as_tuples: bool = False, raw: bool = False) -> List[Any]:
     """
     Retrieve all documents from a MongoDB collection.
 
@@ -16,11 +77,13 @@ def list_all(mongo_collection):
 
     Args:
         mongo_collection: A MongoDB collection object to query
+        fields (Sequence[str], optional): Fields to project, e.g.
+        ('_id', 'name'); full documents are returned when None
+        as_tuples (bool): Return (value, ...) tuples in fields order
+        raw (bool): Return lazily decoded RawBSONDocument objects
 
     Returns:
         list: A list of all documents in the collection, or an empty list
               if the collection contains no documents
     """
-    doc_list = list(mongo_collection.find())
-
-    return [] if len(doc_list) == 0 else doc_list
+    return find_documents(mongo_collection, {}, fields, as_tuples, raw)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark of projected and lean reads for list_all and schools_by_topic.
+
+Seeds a collection with wide school documents, then compares full
+documents against ('_id', 'name') projections returned as dicts, tuples and
+raw BSON. Bytes transferred are measured on the raw BSON replies and decode
+CPU, raw mode included, with time.process_time.
+
+Usage: ./8-benchmark.py [documents] [extra_fields]
+"""
+import sys
+import time
+from typing import Callable, Dict, List
+from pymongo import MongoClient
+list_all = __import__('8-all').list_all
+schools_by_topic = __import__('11-schools_by_topic').schools_by_topic
+
+FIELDS = ('_id', 'name')
+
+
+def seed(collection, documents: int, extra_fields: int) -> None:
+    """Replace the collection content with wide school documents."""
+    collection.drop()
+    filler = {"field_{}".format(i): "x" * 64 for i in range(extra_fields)}
+    collection.insert_many([
+        {"name": "School {}".format(i), "topics": ["Python", "C"], **filler}
+        for i in range(documents)
+    ])
+
+
+def wire_bytes(query: Callable[..., List], collection, **kwargs) -> int:
+    """Return the BSON size of the documents a query transfers."""
+    kwargs = dict(kwargs, raw=True)
+    kwargs.pop('as_tuples', None)
+    return sum(len(doc.raw) for doc in query(collection, **kwargs))
+
+
+def cpu_time(query: Callable[..., List], collection, repeat: int,
+             **kwargs) -> float:
+    """Return the best process time of repeat runs of a query."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        query(collection, **kwargs)
+        best = min(best, time.process_time() - start)
+
+    return best
+
+
+def run(collection, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Measure every read mode of list_all and schools_by_topic."""
+    modes = {
+        "full": {},
+        "projected": {"fields": FIELDS},
+        "tuples": {"fields": FIELDS, "as_tuples": True},
+        "raw": {"fields": FIELDS, "raw": True},
+    }
+    queries = {
+        "list_all": list_all,
+        "schools_by_topic": lambda c, **kw: schools_by_topic(c, "Python",
+                                                             **kw),
+    }
+    report = {}
+    for query_name, query in queries.items():
+        for mode, kwargs in modes.items():
+            report["{} {}".format(query_name, mode)] = {
+                "bytes": wire_bytes(query, collection, **kwargs),
+                "cpu_s": cpu_time(query, collection, repeat, **kwargs),
+            }
+
+    return report
+
+
+if __name__ == "__main__":
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    extra_fields = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    client = MongoClient('mongodb://127.0.0.1:27017')
+    bench_collection = client.my_db.school_benchmark
+    seed(bench_collection, documents, extra_fields)
+
+    for name, result in run(bench_collection).items():
+        print("{:<28} {:>12} bytes {:>9.4f} s cpu".format(
+            name, result["bytes"], result["cpu_s"]))
+
+    bench_collection.drop()
@@ -3,8 +3,10 @@
 MongoDB utility module for inserting school documents into collections.
 
 This module provides functions to insert school-related data into MongoDB
-collections with flexible field support.
+collections with flexible field support. Every inserted school is stamped
+with an 'updated_at' date, which live subscriptions poll on.
 """
+from datetime import datetime, timezone
 
 
 def insert_school(mongo_collection, **kwargs):
@@ -12,7 +14,9 @@ def insert_school(mongo_collection, **kwargs):
     Insert a new school document into the specified MongoDB collection.
 
     This function creates a new document in the provided MongoDB collection
-    using the keyword arguments as fields in the document.
+    using the keyword arguments as fields in the document, plus an
+    'updated_at' field holding the insertion time (UTC) unless the
+    keyword arguments already set one.
 
     Args:
         mongo_collection: A MongoDB collection object where the document will
@@ -23,6 +27,7 @@ def insert_school(mongo_collection, **kwargs):
     Returns:
         ObjectId: The ID of the newly inserted document
     """
-    result = mongo_collection.insert_one({**kwargs})
+    result = mongo_collection.insert_one(
+        {'updated_at': datetime.now(timezone.utc), **kwargs})
 
     return result.inserted_id
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Importable facade over the project helpers.
+
+The helpers live in hyphenated modules (0-add.py, 8-all.py, ...) spread
+over the project directories. This package exposes them by name, through
+one lazily loaded subpackage per directory:
+
+    annotations          python_variable_annotations
+    async_comprehension  python_async_comprehension
+    async_function       python_async_function
+    nosql                NoSQL
+    pagination           pagination
+
+Nothing is imported until a name is used, so importing
+backend_helpers.annotations.add loads 0-add.py only, not pymongo, asyncio
+or csv. Run python -m backend_helpers.importtime to measure it.
+
+Example:
+    >>> from backend_helpers.pagination import index_range
+    >>> index_range(1, 7)
+    (0, 7)
+"""
+
+import importlib
+
+SUBPACKAGES = ("annotations", "async_comprehension", "async_function",
+               "nosql", "pagination")
+
+__all__ = list(SUBPACKAGES)
+
+
+def __getattr__(name: str) -> object:
+    """Import a subpackage on first use."""
+    if name in SUBPACKAGES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(
+        __name__, name))
+
+
+def __dir__() -> list[str]:
+    """List the subpackages, imported or not."""
+    return sorted(set(SUBPACKAGES) | set(globals()))
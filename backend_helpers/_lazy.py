@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Lazy loading of the hyphenated project modules.
+
+The project directories hold modules such as 0-basic_async_syntax.py that
+cannot be imported with an import statement and that load their siblings
+with __import__('1-concurrent_coroutines'), which only works when their
+directory is on sys.path. Here every directory is a subpackage of
+backend_helpers instead (its __path__ includes the directory), so a module
+is imported, byte-code cached and pickled under a qualified name such as
+backend_helpers.async_function.1-concurrent_coroutines. While it runs, a
+meta path finder resolves the bare sibling names it asks for to the same
+qualified modules, so the bare names of two directories, like both
+2-measure_runtime, never clash and nothing is executed twice.
+attach() builds the module __getattr__ and __dir__ of a facade package
+from a registry of exported names.
+
+typing is deliberately not imported, as it alone takes longer to import
+than the facade: annotations are left unevaluated and use the builtin
+generics.
+"""
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import threading
+from collections.abc import Callable
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _SiblingFinder:
+    """Meta path finder mapping bare sibling names to qualified modules.
+
+    It only answers while load_module() runs, for the directory of the
+    innermost module being loaded.
+    """
+
+    def __init__(self) -> None:
+        """Start with no module being loaded."""
+        self.lock = threading.RLock()
+        self.active: list[tuple[str, frozenset]] = []
+        self.aliases: list[str] = []
+        self.specs: dict[str, ModuleSpec] = {}
+
+    def find_spec(self, name: str, path: object = None,
+                  target: object = None) -> ModuleSpec | None:
+        """Return an alias spec when name is a sibling module."""
+        if not self.active or path is not None:
+            return None
+        package, stems = self.active[-1]
+        if name not in stems:
+            return None
+        self.aliases.append(name)
+        return ModuleSpec(name, self, origin=package + "." + name)
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType:
+        """Import the qualified module and hand it out for the bare name."""
+        module = importlib.import_module(spec.origin)
+        self.specs[spec.name] = module.__spec__
+        return module
+
+    def exec_module(self, module: ModuleType) -> None:
+        """Give back the spec the import system replaced by the alias one;
+        the module itself was executed by create_module."""
+        module.__spec__ = self.specs.pop(module.__spec__.name)
+
+
+_finder = _SiblingFinder()
+_stems: dict[str, frozenset] = {}
+
+
+def load_module(package: str, directory: str, stem: str) -> ModuleType:
+    """
+    Import the module stem.py of directory as a submodule of package.
+
+    Args:
+        package (str): The facade package, whose __path__ has directory
+        directory (str): Absolute path of the project directory
+        stem (str): The module file name without .py
+
+    Returns:
+        ModuleType: The loaded module
+    """
+    qualified = "{}.{}".format(package, stem)
+    module = sys.modules.get(qualified)
+    if module is not None:
+        return module
+
+    with _finder.lock:
+        if directory not in _stems:
+            _stems[directory] = frozenset(
+                name[:-3] for name in os.listdir(directory)
+                if name.endswith(".py"))
+        stems = _stems[directory]
+        # Bare names of this directory may be taken by other modules, for
+        # instance the other 2-measure_runtime: hide them during the load.
+        shadowed = {name: sys.modules.pop(name) for name in stems
+                    if name in sys.modules}
+        if not _finder.active:
+            sys.meta_path.insert(0, _finder)
+        _finder.active.append((package, stems))
+        try:
+            return importlib.import_module(qualified)
+        finally:
+            _finder.active.pop()
+            if not _finder.active:
+                sys.meta_path.remove(_finder)
+                while _finder.aliases:
+                    sys.modules.pop(_finder.aliases.pop(), None)
+            sys.modules.update(shadowed)
+
+
+def attach(package: str, directory: str, exports: dict[str, str]
+           ) -> tuple[Callable[[str], object], Callable[[], list[str]],
+                      list[str]]:
+    """
+    Build the lazy attribute hooks of a facade package.
+
+    Each export maps a public name to "stem" (the attribute of the same
+    name in stem.py), "stem:attribute" (a renamed attribute) or "stem:"
+    (the module itself). Nothing is imported until a name is first used;
+    it is then cached in the package namespace.
+
+    Args:
+        package (str): The facade package name, usually __name__
+        directory (str): The project directory, relative to the repository
+        exports (dict[str, str]): The registry of public names
+
+    Returns:
+        Tuple: The __getattr__, __dir__ and __all__ of the package
+
+    Examples:
+        >>> __getattr__, __dir__, __all__ = attach(
+        ...     __name__, "pagination", {"Server": "2-hypermedia_pagination"})
+    """
+    directory = os.path.join(ROOT, directory)
+    sys.modules[package].__path__.append(directory)
+
+    def __getattr__(name: str) -> object:
+        """Load the module exporting name and return the attribute."""
+        try:
+            stem, _, attribute = exports[name].partition(":")
+        except KeyError:
+            raise AttributeError("module {!r} has no attribute {!r}".format(
+                package, name)) from None
+        module = load_module(package, directory, stem)
+        if exports[name].endswith(":"):
+            value = module
+        else:
+            value = getattr(module, attribute or name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        """List the exported names, loaded or not."""
+        return sorted(set(exports) | {name for name in vars(
+            sys.modules[package]) if name.isidentifier()})
+
+    return __getattr__, __dir__, sorted(exports)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Lazy facade over the python_variable_annotations directory."""
+
+from backend_helpers._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__, "python_variable_annotations", {
+        "add": "0-add",
+        "concat": "1-concat",
+        "floor": "2-floor",
+        "to_str": "3-to_str",
+        "define_variables": "4-define_variables:",
+        "sum_list": "5-sum_list",
+        "sum_mixed_list": "6-sum_mixed_list",
+        "to_kv": "7-to_kv",
+        "KVColumns": "7-to_kv",
+        "to_kv_batch": "7-to_kv",
+        "make_multiplier": "8-make_multiplier",
+        "Multiplier": "8-make_multiplier",
+        "compose": "8-make_multiplier",
+        "element_length": "9-element_length",
+        "iter_element_length": "9-element_length",
+        "element_lengths": "9-element_length",
+        "length_histogram": "9-element_length",
+        "line_length_histogram": "9-element_length",
+        "float_buffer": "10-numeric_kernels",
+        "fast_sum": "10-numeric_kernels",
+        "chunked_sum": "10-numeric_kernels",
+        "parallel_sum_file": "11-parallel_sum",
+        "parallel_sum_shared": "11-parallel_sum",
+        "stream_sum_file": "11-parallel_sum",
+    })
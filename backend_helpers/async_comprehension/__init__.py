@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""Lazy facade over the python_async_comprehension directory."""
+
+from backend_helpers._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__, "python_async_comprehension", {
+        "async_generator": "0-async_generator",
+        "async_comprehension": "1-async_comprehension",
+        "measure_runtime": "2-measure_runtime",
+        "Pipeline": "3-stream_pipeline",
+        "merge": "4-merge_streams",
+        "merge_ordered": "4-merge_streams",
+        "async_comprehension_array": "5-batched_comprehension",
+        "reduce_values": "5-batched_comprehension",
+        "StreamMetrics": "6-safe_generator",
+        "guarded": "6-safe_generator",
+        "closing": "6-safe_generator",
+        "gather_with_timeout": "6-safe_generator",
+        "measure_runtime_bounded": "6-safe_generator",
+    })
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Lazy facade over the python_async_function directory.
+
+wait_n and task_wait_n are the originals of 1-concurrent_coroutines and
+4-tasks; the variants of the later modules keep their own names or are
+reached through their module.
+"""
+
+from backend_helpers._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, "python_async_function", {
+    "wait_random": "0-basic_async_syntax",
+    "wait_n": "1-concurrent_coroutines",
+    "measure_time": "2-measure_runtime",
+    "task_wait_random": "3-tasks",
+    "task_wait_n": "4-tasks",
+    "bounded_as_completed": "5-bounded_scheduler",
+    "bounded_wait_n": "5-bounded_scheduler",
+    "bounded_task_wait_n": "5-bounded_scheduler",
+    "gather_completed": "6-completion_collector",
+    "VirtualClockEventLoop": "7-virtual_clock",
+    "run_virtual": "7-virtual_clock",
+    "measure_time_virtual": "7-virtual_clock",
+    "profile": "8-runtime_profiler",
+    "profile_all": "8-runtime_profiler",
+    "sharded_wait_n": "9-sharded_executor",
+    "sharded_task_wait_n": "9-sharded_executor",
+    "Instrumentation": "10-instrumentation",
+    "instrumentation": "10-instrumentation",
+    "ResilientRunner": "11-resilient_runner",
+    "resilient_wait_n": "11-resilient_runner",
+    "resilient_task_wait_n": "11-resilient_runner",
+    "completion_collector": "6-completion_collector:",
+    "runtime_profiler": "8-runtime_profiler:",
+    "sharded_executor": "9-sharded_executor:",
+    "resilient_runner": "11-resilient_runner:",
+})
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark of the facade.
+
+Each scenario runs in a fresh interpreter under -X importtime, which
+reports the cumulative import time of every module on stderr. The script
+prints the total, and whether pymongo, asyncio or csv were imported, for
+a helper reached through the facade and for the same helper imported
+eagerly from its directory.
+
+Usage:
+    python3 -m backend_helpers.importtime [--repeat N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from backend_helpers._lazy import ROOT
+
+HEAVY = ("pymongo", "asyncio", "csv")
+
+SCENARIOS: List[Tuple[str, str]] = [
+    ("facade package only", "import backend_helpers"),
+    ("facade annotations.add",
+     "from backend_helpers.annotations import add"),
+    ("facade pagination.index_range",
+     "from backend_helpers.pagination import index_range"),
+    ("facade async_function.wait_n",
+     "from backend_helpers.async_function import wait_n"),
+    ("eager pagination/2-hypermedia_pagination",
+     "import sys; sys.path.insert(0, 'pagination'); "
+     "__import__('2-hypermedia_pagination')"),
+    ("eager python_async_function/4-tasks",
+     "import sys; sys.path.insert(0, 'python_async_function'); "
+     "__import__('4-tasks')"),
+]
+
+
+def import_times(code: str) -> Dict[str, int]:
+    """
+    Run code in a fresh interpreter and return its import times.
+
+    Args:
+        code (str): The Python statements to run
+
+    Returns:
+        Dict[str, int]: Cumulative microseconds per import, nested ones
+                        being prefixed with spaces
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+        capture_output=True, text=True, check=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name[1:].rstrip()] = int(cumulative)
+
+    return times
+
+
+def main() -> None:
+    """Print the import time and heavy imports of every scenario."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per scenario, the best one is kept")
+    args = parser.parse_args()
+
+    # Modules imported by the bare interpreter are not part of a scenario.
+    baseline = set(import_times("pass"))
+    for name, code in SCENARIOS:
+        best, heavy = None, []
+        for _ in range(args.repeat):
+            times = import_times(code)
+            total = sum(cumulative for module, cumulative in times.items()
+                        if module not in baseline and not module[:1].isspace())
+            best = total if best is None else min(best, total)
+            loaded = {module.strip() for module in times}
+            heavy = [module for module in HEAVY if module in loaded]
+        print("{:<42} {:>8.1f} ms  heavy: {}".format(
+            name, best / 1000, ", ".join(heavy) or "-"))
+
+
+if __name__ == "__main__":
+    os.environ.pop("PYTHONPATH", None)
+    main()
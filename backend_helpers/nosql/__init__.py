@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Lazy facade over the NoSQL directory.
+
+Most helpers take a pymongo collection; pymongo (or bson) is only
+imported by the modules that need it, when one of their names is used.
+"""
+
+from backend_helpers._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, "NoSQL", {
+    "build_projection": "8-all",
+    "find_documents": "8-all",
+    "list_all": "8-all",
+    "insert_school": "9-insert_school",
+    "update_topics": "10-update_topics",
+    "add_topics": "10-update_topics",
+    "remove_topics": "10-update_topics",
+    "replace_topics": "10-update_topics",
+    "bulk_update_topics": "10-update_topics",
+    "schools_by_topic": "11-schools_by_topic",
+    "log_stats": "12-log_stats",
+    "list_all_async": "13-async_helpers",
+    "insert_school_async": "13-async_helpers",
+    "update_topics_async": "13-async_helpers",
+    "schools_by_topic_async": "13-async_helpers",
+    "insert_schools_async": "13-async_helpers",
+    "update_topics_many_async": "13-async_helpers",
+    "collect_log_stats": "13-async_helpers",
+    "log_stats_async": "13-async_helpers",
+    "FakeAsyncCollection": "13-async_helpers",
+    "LogRollup": "14-log_rollups",
+    "offline_log_stats": "15-offline_log_stats",
+    "LiveQuery": "16-live_pagination",
+    "live_schools_by_topic": "16-live_pagination",
+    "all": "8-all:",
+    "async_helpers": "13-async_helpers:",
+    "log_rollups": "14-log_rollups:",
+    "offline": "15-offline_log_stats:",
+})
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Lazy facade over the pagination directory.
+
+Server is the hypermedia server of 2-hypermedia_pagination and
+IndexedServer the deletion-resilient one of 3-hypermedia_del_pagination.
+Both read Popular_Baby_Names.csv from the current working directory.
+"""
+
+from backend_helpers._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, "pagination", {
+    "index_range": "0-simple_helper_function",
+    "Server": "2-hypermedia_pagination",
+    "SimpleServer": "1-simple_pagination:Server",
+    "IndexedServer": "3-hypermedia_del_pagination:Server",
+    "load_rows": "4-parallel_loader",
+    "load_columns": "4-parallel_loader",
+    "ParallelServer": "4-parallel_loader",
+    "PageCache": "5-page_cache",
+    "PageCacheMixin": "5-page_cache",
+    "CachedServer": "5-page_cache",
+    "simple_helper_function": "0-simple_helper_function:",
+    "simple_pagination": "1-simple_pagination:",
+    "hypermedia_pagination": "2-hypermedia_pagination:",
+    "hypermedia_del_pagination": "3-hypermedia_del_pagination:",
+    "parallel_loader": "4-parallel_loader:",
+    "page_cache": "5-page_cache:",
+})
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark file: python3 4-benchmark.py [copies]
+
+Writes a larger dataset made of copies of Popular_Baby_Names.csv, then
+times Server.dataset() against load_rows and load_columns.
+"""
+import os
+import sys
+import tempfile
+import time
+
+parallel_loader = __import__('4-parallel_loader')
+Server = __import__('2-hypermedia_pagination').Server
+
+
+def timed(name, function):
+    """Print how long function takes and return its result."""
+    start = time.perf_counter()
+    result = function()
+    print("{:<28} {:.3f}s".format(name, time.perf_counter() - start))
+    return result
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with open("Popular_Baby_Names.csv") as f:
+        header = f.readline()
+        body = f.read()
+    with tempfile.NamedTemporaryFile('w', suffix=".csv", delete=False) as f:
+        f.write(header + body * copies)
+
+    try:
+        server = Server()
+        server.DATA_FILE = f.name
+        expected = timed("Server.dataset", server.dataset)
+        for workers in sorted({1, os.cpu_count() or 1}):
+            rows = timed("load_rows workers={}".format(workers),
+                         lambda: parallel_loader.load_rows(f.name, workers,
+                                                           1 << 22))
+            print("identical:", rows == expected)
+            timed("load_columns workers={}".format(workers),
+                  lambda: parallel_loader.load_columns(
+                      f.name,
+                      {"Year of Birth": int, "Count": int, "Rank": int},
+                      workers, 1 << 22))
+    finally:
+        os.unlink(f.name)
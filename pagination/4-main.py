@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+parallel_loader = __import__('4-parallel_loader')
+Server = __import__('2-hypermedia_pagination').Server
+
+if __name__ == "__main__":
+    rows = parallel_loader.load_rows("Popular_Baby_Names.csv",
+                                     chunk_bytes=65536)
+    print(len(rows), rows[0])
+    print(rows == Server().dataset())
+
+    columns = parallel_loader.load_columns(
+        "Popular_Baby_Names.csv",
+        {"Year of Birth": int, "Count": int, "Rank": int}, chunk_bytes=65536)
+    print(list(columns), columns["Count"][:3])
+
+    server = parallel_loader.ParallelServer(chunk_bytes=65536)
+    print(server.get_hyper(2, 2))
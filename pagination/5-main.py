@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+CachedServer = __import__('5-page_cache').CachedServer
+Server = __import__('2-hypermedia_pagination').Server
+
+server = CachedServer(cache_budget=1 << 20, prefetch_pages=2)
+
+print(server.get_hyper(1, 2) == Server().get_hyper(1, 2))
+print(server.get_hyper(3000, 100))
+
+for page in range(1, 51):
+    server.get_page(page, 100)
+server.get_page(1, 100)
+server.get_page(1, 100)
+
+print(server.cache_stats())
+server.close()
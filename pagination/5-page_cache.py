@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Page cache module.
+
+This module adds a bounded page cache to the pagination servers. Pages are
+kept in least-recently-used order and evicted once their estimated memory
+exceeds a byte budget. When a client reads pages in order, the next pages
+are prefetched in a background thread, so that scrolling clients find
+them ready. Hit-rate and prefetch-waste statistics are exposed.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+Server = __import__('2-hypermedia_pagination').Server
+index_range = __import__('2-hypermedia_pagination').index_range
+
+Key = Tuple[int, int]
+
+
+def rows_size(rows: List[List]) -> int:
+    """
+    Estimate the memory used by a page of rows, in bytes.
+
+    The rows and their values are counted as if the page owned them, which
+    is exact for pages fetched from a file or a remote service and an upper
+    bound for slices of an in-memory dataset.
+
+    Args:
+        rows (List[List]): The rows of a page.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+    return sys.getsizeof(rows) + sum(
+        sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in rows)
+
+
+class _Entry:
+    """Cached page with its size and prefetch bookkeeping."""
+
+    __slots__ = ('rows', 'size', 'prefetched', 'used')
+
+    def __init__(self, rows: List[List], size: int, prefetched: bool):
+        """Store a page of rows, unused so far."""
+        self.rows = rows
+        self.size = size
+        self.prefetched = prefetched
+        self.used = False
+
+
+class PageCache:
+    """Thread-safe LRU cache of pages bounded by a memory budget.
+    """
+
+    def __init__(self, budget: int = 8 << 20):
+        """
+        Create an empty cache.
+
+        Args:
+            budget (int, optional): Maximum estimated size of the cached
+            pages, in bytes. Defaults to 8 MiB.
+        """
+        assert budget > 0, "budget must be positive"
+        self.budget = budget
+        self.size = 0
+        self.lock = threading.Lock()
+        self.__entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefetched = 0
+        self.prefetch_used = 0
+        self.prefetch_wasted = 0
+
+    def __contains__(self, key: Key) -> bool:
+        """Tell whether a page is cached, without counting a lookup."""
+        with self.lock:
+            return key in self.__entries
+
+    def get(self, key: Key) -> Optional[List[List]]:
+        """Return a cached page and mark it recently used, or None."""
+        with self.lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.__entries.move_to_end(key)
+            if entry.prefetched and not entry.used:
+                self.prefetch_used += 1
+            entry.used = True
+            return entry.rows
+
+    def put(self, key: Key, rows: List[List],
+            prefetched: bool = False) -> None:
+        """Cache a page, evicting the least recently used ones if needed.
+
+        A page larger than the whole budget is not cached.
+        """
+        size = rows_size(rows)
+        with self.lock:
+            if size > self.budget or key in self.__entries:
+                return
+            self.__entries[key] = _Entry(rows, size, prefetched)
+            self.size += size
+            self.prefetched += prefetched
+            while self.size > self.budget:
+                _, entry = self.__entries.popitem(last=False)
+                self.size -= entry.size
+                self.evictions += 1
+                if entry.prefetched and not entry.used:
+                    self.prefetch_wasted += 1
+
+    def stats(self) -> Dict:
+        """
+        Return the cache statistics.
+
+        Returns:
+            Dict: hits, misses, hit_rate, entries, size and budget (bytes),
+            evictions, prefetched pages, prefetch_used (prefetched pages
+            read at least once) and prefetch_wasted (prefetched pages
+            evicted without being read).
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.__entries),
+                "size": self.size,
+                "budget": self.budget,
+                "evictions": self.evictions,
+                "prefetched": self.prefetched,
+                "prefetch_used": self.prefetch_used,
+                "prefetch_wasted": self.prefetch_wasted,
+            }
+
+
+class PageCacheMixin:
+    """Adds a page cache with sequential prefetch to a pagination server.
+
+    It caches whatever get_page of the next class in the MRO returns, so it
+    can be combined with any server, for instance
+    class CachedParallelServer(PageCacheMixin, ParallelServer).
+    get_hyper calls get_page and is therefore served from the cache too.
+    get_page can be called from several threads at once: concurrent misses
+    on a page share a single fetch.
+    """
+
+    def __init__(self, *args, cache_budget: int = 8 << 20,
+                 prefetch_pages: int = 2, sequential_after: int = 1,
+                 **kwargs):
+        """
+        Configure the cache, passing the other arguments to the server.
+
+        Args:
+            cache_budget (int, optional): Memory budget of the cache, in
+            bytes.
+            prefetch_pages (int, optional): Number of pages prefetched
+            ahead, 0 to disable prefetching.
+            sequential_after (int, optional): Number of consecutive forward
+            steps (page n, then n + 1) before prefetching starts.
+        """
+        super().__init__(*args, **kwargs)
+        self.page_cache = PageCache(cache_budget)
+        self.prefetch_pages = prefetch_pages
+        self.sequential_after = sequential_after
+        self.__last: Optional[Key] = None
+        self.__streak = 0
+        self.__inflight: Dict[Key, Future] = {}
+        self.__lock = threading.Lock()
+        self.__executor: Optional[ThreadPoolExecutor] = None
+
+    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+        """
+        Retrieve a page, from the cache when possible.
+
+        A page being prefetched or fetched by another caller is waited for
+        rather than fetched twice. The returned list is a copy, so callers
+        cannot alter the cache.
+
+        Args:
+            page (int, optional): The page number to retrieve (1-indexed).
+            Defaults to 1.
+            page_size (int, optional): Number of records per page. Defaults to
+            10.
+
+        Returns:
+            List[List]: A list of rows for the specified page,
+                       or an empty list if the page is out of range.
+        """
+        assert (isinstance(page, int) and
+                isinstance(page_size, int) and
+                page > 0 and
+                page_size > 0)
+
+        key = (page, page_size)
+        with self.__lock:
+            future = self.__inflight.get(key)
+        if future is not None:
+            wait([future])
+        rows = self.page_cache.get(key)
+        if rows is None:
+            rows = self.__fetch(key)
+        self.__track(page, page_size)
+
+        return list(rows)
+
+    def __fetch(self, key: Key) -> List[List]:
+        """Fetch and cache a missed page, sharing the fetch with concurrent
+        callers: the first registers it as in flight, the others wait.
+        """
+        with self.__lock:
+            future = self.__inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self.__inflight[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            rows = super().get_page(*key)
+            self.page_cache.put(key, rows)
+            future.set_result(rows)
+            return rows
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self.__lock:
+                self.__inflight.pop(key, None)
+
+    def __track(self, page: int, page_size: int) -> None:
+        """Update the sequential streak and prefetch when it is long enough.
+        """
+        with self.__lock:
+            if self.__last == (page - 1, page_size):
+                self.__streak += 1
+            else:
+                self.__streak = 0
+            self.__last = (page, page_size)
+            streak = self.__streak
+        if streak < self.sequential_after:
+            return
+
+        length = len(self.dataset())
+        for ahead in range(page + 1, page + 1 + self.prefetch_pages):
+            key = (ahead, page_size)
+            if index_range(ahead, page_size)[0] >= length:
+                break
+            with self.__lock:
+                if key in self.__inflight or key in self.page_cache:
+                    continue
+                if self.__executor is None:
+                    self.__executor = ThreadPoolExecutor(
+                        1, thread_name_prefix="page-prefetch")
+                self.__inflight[key] = self.__executor.submit(
+                    self.__prefetch, key)
+
+    def __prefetch(self, key: Key) -> List[List]:
+        """Fetch a page in the background and cache it as prefetched."""
+        try:
+            rows = super().get_page(*key)
+            self.page_cache.put(key, rows, prefetched=True)
+            return rows
+        finally:
+            with self.__lock:
+                self.__inflight.pop(key, None)
+
+    def cache_stats(self) -> Dict:
+        """Return the page cache statistics (see PageCache.stats)."""
+        return self.page_cache.stats()
+
+    def close(self) -> None:
+        """Stop the prefetch thread, dropping prefetches not started yet.
+        """
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with self.__lock:
+            # Drop the prefetches cancelled before they started.
+            self.__inflight = {key: future for key, future
+                               in self.__inflight.items()
+                               if not future.done()}
+
+
+class CachedServer(PageCacheMixin, Server):
+    """Hypermedia pagination server with a page cache and prefetching.
+    """
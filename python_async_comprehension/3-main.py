@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+
+import asyncio
+
+async_generator = __import__('0-async_generator').async_generator
+Pipeline = __import__('3-stream_pipeline').Pipeline
+
+
+async def main():
+    pipeline = (Pipeline(async_generator(), maxsize=2)
+                .filter(lambda value: value > 2)
+                .map(round)
+                .batch(3))
+    async for batch in pipeline:
+        print(batch)
+
+    print(await Pipeline(async_generator()).window(3, step=3).collect(2))
+
+asyncio.run(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Module providing backpressured stream pipelines over async generators.
+
+A Pipeline wraps an async iterable such as async_generator() and chains
+map, filter, batch and window stages. Every stage runs as its own task and
+stages are connected by bounded queues, so a slow consumer pauses the whole
+chain and memory stays constant whatever the length of the source. Leaving
+the iteration early cancels every stage and closes the source.
+"""
+
+import asyncio
+import inspect
+from collections import deque
+from typing import (Any, AsyncIterable, AsyncIterator, Callable, List,
+                    Optional, Tuple)
+
+_END = object()
+
+
+class _Failure:
+    """Exception travelling down the queues to the consumer."""
+
+    def __init__(self, error: BaseException):
+        """Wrap the exception raised by a stage or the source."""
+        self.error = error
+
+
+async def _drain(inbox: asyncio.Queue) -> AsyncIterator[Any]:
+    """Yield the items of a queue until the end marker."""
+    while True:
+        item = await inbox.get()
+        if item is _END:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+async def _call(function: Callable, item: Any) -> Any:
+    """Call a sync or async function on item."""
+    result = function(item)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def _pump(source: AsyncIterable, outbox: asyncio.Queue) -> None:
+    """Feed the items of the source into the first queue."""
+    try:
+        async for item in source:
+            await outbox.put(item)
+    except Exception as error:
+        await outbox.put(_Failure(error))
+        return
+    finally:
+        aclose = getattr(source, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    await outbox.put(_END)
+
+
+async def _stage(operator: Callable[[AsyncIterator], AsyncIterator],
+                 inbox: asyncio.Queue, outbox: asyncio.Queue) -> None:
+    """Run an async generator operator between two queues."""
+    try:
+        async for item in operator(_drain(inbox)):
+            await outbox.put(item)
+    except Exception as error:
+        await outbox.put(_Failure(error))
+        return
+    await outbox.put(_END)
+
+
+async def _map_worker(function: Callable, inbox: asyncio.Queue,
+                      outbox: asyncio.Queue, running: List[int]) -> None:
+    """One of several workers of a concurrent map stage."""
+    while True:
+        item = await inbox.get()
+        if item is _END:
+            # Let the sibling workers see the end marker too.
+            inbox.put_nowait(_END)
+            running[0] -= 1
+            if running[0] == 0:
+                await outbox.put(_END)
+            return
+        if isinstance(item, _Failure):
+            await outbox.put(item)
+            return
+        try:
+            result = await _call(function, item)
+        except Exception as error:
+            await outbox.put(_Failure(error))
+            return
+        await outbox.put(result)
+
+
+class Pipeline:
+    """Chain of concurrent, backpressured stages over an async iterable.
+
+    Example:
+        >>> pipeline = (Pipeline(async_generator())
+        ...             .filter(lambda value: value > 5)
+        ...             .map(round)
+        ...             .batch(3))
+        >>> async for batch in pipeline:
+        ...     print(batch)
+
+    A consumer breaking out of the loop should aclose() the iterator it
+    got from aiter() (collect() does) to stop the stages right away
+    rather than when the generator is garbage collected.
+    """
+
+    def __init__(self, source: AsyncIterable, maxsize: int = 16):
+        """
+        Start a pipeline over source.
+
+        Args:
+            source: The async iterable feeding the pipeline.
+            maxsize: Capacity of every queue between two stages.
+        """
+        assert maxsize > 0, "maxsize must be positive"
+        self.source = source
+        self.maxsize = maxsize
+        self.stages: List[Tuple[str, Any]] = []
+
+    def map(self, function: Callable, workers: int = 1) -> "Pipeline":
+        """
+        Apply a sync or async function to every item.
+
+        With more than one worker, items are processed concurrently and
+        emitted in completion order.
+        """
+        assert workers > 0, "workers must be positive"
+        if workers == 1:
+            async def operator(items: AsyncIterator) -> AsyncIterator:
+                """Yield function(item) for every item, in order."""
+                async for item in items:
+                    yield await _call(function, item)
+            self.stages.append(("stage", operator))
+        else:
+            self.stages.append(("map", (function, workers)))
+        return self
+
+    def filter(self, predicate: Callable) -> "Pipeline":
+        """Keep the items for which a sync or async predicate is true."""
+        async def operator(items: AsyncIterator) -> AsyncIterator:
+            """Yield the items accepted by the predicate."""
+            async for item in items:
+                if await _call(predicate, item):
+                    yield item
+        self.stages.append(("stage", operator))
+        return self
+
+    def batch(self, size: int) -> "Pipeline":
+        """Group items into lists of size items, the last may be shorter."""
+        assert size > 0, "size must be positive"
+
+        async def operator(items: AsyncIterator) -> AsyncIterator:
+            """Yield the items grouped in lists of size."""
+            batch = []
+            async for item in items:
+                batch.append(item)
+                if len(batch) == size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        self.stages.append(("stage", operator))
+        return self
+
+    def window(self, size: int, step: int = 1) -> "Pipeline":
+        """Emit tuples of the last size items every step items."""
+        assert size > 0 and step > 0, "size and step must be positive"
+
+        async def operator(items: AsyncIterator) -> AsyncIterator:
+            """Yield a sliding window of size items every step items."""
+            window: deque = deque(maxlen=size)
+            seen = 0
+            async for item in items:
+                window.append(item)
+                seen += 1
+                if seen >= size and (seen - size) % step == 0:
+                    yield tuple(window)
+        self.stages.append(("stage", operator))
+        return self
+
+    def __aiter__(self) -> AsyncIterator:
+        """Start the stages and iterate over the output of the last one."""
+        return self._run()
+
+    async def _run(self) -> AsyncIterator:
+        """Wire the queues, run the stages and yield the results."""
+        queue: asyncio.Queue = asyncio.Queue(self.maxsize)
+        tasks = [asyncio.ensure_future(_pump(self.source, queue))]
+        for kind, spec in self.stages:
+            inbox, queue = queue, asyncio.Queue(self.maxsize)
+            if kind == "map":
+                function, workers = spec
+                running = [workers]
+                tasks.extend(asyncio.ensure_future(
+                    _map_worker(function, inbox, queue, running))
+                    for _ in range(workers))
+            else:
+                tasks.append(asyncio.ensure_future(
+                    _stage(spec, inbox, queue)))
+        try:
+            async for item in _drain(queue):
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def collect(self, limit: Optional[int] = None) -> List[Any]:
+        """Return the output as a list, stopping after limit items."""
+        results: List[Any] = []
+        if limit is not None and limit <= 0:
+            return results
+        stream = self._run()
+        try:
+            async for item in stream:
+                results.append(item)
+                if limit is not None and len(results) >= limit:
+                    break
+        finally:
+            await stream.aclose()
+        return results
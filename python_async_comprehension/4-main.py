@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+
+async_generator = __import__('0-async_generator').async_generator
+async_comprehension = __import__('1-async_comprehension').async_comprehension
+merge_streams = __import__('4-merge_streams')
+
+
+async def main():
+    start = time.perf_counter()
+    await asyncio.gather(*(async_comprehension() for _ in range(4)))
+    print("gather: first item after {:.2f} s".format(
+        time.perf_counter() - start))
+
+    start = time.perf_counter()
+    first = None
+    count = 0
+    async for _ in merge_streams.merge(*(async_generator()
+                                         for _ in range(4))):
+        first = first or time.perf_counter() - start
+        count += 1
+    print("merge: first item after {:.2f} s, {} items in {:.2f} s".format(
+        first, count, time.perf_counter() - start))
+
+    async def sorted_stream(offset):
+        for value in range(offset, 20, 3):
+            await asyncio.sleep(0.1)
+            yield value
+
+    print([value async for value in merge_streams.merge_ordered(
+        sorted_stream(0), sorted_stream(1), sorted_stream(2))])
+
+asyncio.run(main())
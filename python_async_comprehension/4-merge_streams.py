@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Module for merging many async generators into a single stream.
+
+merge() consumes every source concurrently and yields items as they
+arrive, so the first value is available after about one second instead of
+after measure_runtime's gather of four full async_comprehension calls.
+merge_ordered() performs a heap-based k-way merge of sources that are
+already sorted. Both keep at most a few items per source in memory.
+"""
+
+import asyncio
+import heapq
+from typing import Any, AsyncIterable, AsyncIterator, Callable, List, Optional
+
+_END = object()
+
+
+async def _close(source: AsyncIterable) -> None:
+    """Close a source that is an async generator."""
+    aclose = getattr(source, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+async def _forward(source: AsyncIterable, queue: asyncio.Queue) -> None:
+    """Put every item of source in queue, then an end marker."""
+    try:
+        async for item in source:
+            await queue.put((item, None))
+    except Exception as error:
+        await queue.put((_END, error))
+        return
+    finally:
+        await _close(source)
+    await queue.put((_END, None))
+
+
+async def merge(*sources: AsyncIterable) -> AsyncIterator[Any]:
+    """
+    Interleave the items of several async iterables as they arrive.
+
+    The shared queue holds at most one item per source, so sources are
+    paused while the consumer lags behind. An exception raised by a source
+    cancels the others and is re-raised.
+
+    Args:
+        *sources: The async iterables to merge.
+
+    Yields:
+        The items of all sources, in arrival order.
+
+    Example:
+        >>> async for value in merge(async_generator(), async_generator()):
+        ...     print(value)
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, len(sources)))
+    tasks = [asyncio.ensure_future(_forward(source, queue))
+             for source in sources]
+    running = len(tasks)
+    try:
+        while running:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is _END:
+                running -= 1
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def merge_ordered(*sources: AsyncIterable,
+                        key: Optional[Callable[[Any], Any]] = None
+                        ) -> AsyncIterator[Any]:
+    """
+    Merge async iterables that are each sorted into one sorted stream.
+
+    The head of every source is kept in a heap; after yielding the
+    smallest, only the source it came from is advanced. The first heads are
+    fetched concurrently.
+
+    Args:
+        *sources: The sorted async iterables to merge.
+        key: Optional function extracting the sort key of an item.
+
+    Yields:
+        The items of all sources, in key order (ties keep source order).
+    """
+    key = key or (lambda item: item)
+    iterators = [source.__aiter__() for source in sources]
+
+    async def head(index: int) -> List:
+        """Return the heap entry of the next item of a source, or []."""
+        try:
+            item = await iterators[index].__anext__()
+        except StopAsyncIteration:
+            return []
+        return [(key(item), index, item)]
+
+    try:
+        heads = await asyncio.gather(*(head(index)
+                                       for index in range(len(iterators))))
+        heap = [entry for entries in heads for entry in entries]
+        heapq.heapify(heap)
+        while heap:
+            _, index, item = heap[0]
+            yield item
+            entries = await head(index)
+            if entries:
+                heapq.heapreplace(heap, entries[0])
+            else:
+                heapq.heappop(heap)
+    finally:
+        await asyncio.gather(*(_close(iterator) for iterator in iterators),
+                             return_exceptions=True)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Module collecting async generator output into compact float buffers.
+
+Instead of building a list of boxed floats like async_comprehension, the
+values are appended to an array('d') (8 bytes per value), which NumPy can
+view without copying for vectorized reductions when it is installed. The
+reductions return the same results for lists and arrays.
+"""
+
+import math
+from array import array
+from typing import AsyncIterable, Dict, Optional, Sequence
+async_generator = __import__('0-async_generator').async_generator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+async def async_comprehension_array(source: Optional[AsyncIterable] = None
+                                    ) -> array:
+    """
+    Collect the values of an async generator into an array('d').
+
+    Appending to the array costs slightly more per value than a list
+    comprehension, in exchange for about a quarter of the memory.
+
+    Args:
+        source: Async iterable of floats, defaults to async_generator().
+
+    Returns:
+        array: The collected values, in order.
+
+    Example:
+        >>> values = await async_comprehension_array()
+        >>> len(values)
+        10
+    """
+    values = array('d')
+    append = values.append
+    async for value in source or async_generator():
+        append(value)
+
+    return values
+
+
+def _percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Return the linearly interpolated percentile of sorted values."""
+    position = (len(ordered) - 1) * fraction
+    low, high = math.floor(position), math.ceil(position)
+    low_value, high_value = ordered[low], ordered[high]
+    return low_value + (high_value - low_value) * (position - low)
+
+
+def reduce_values(values: Sequence[float],
+                  percentiles: Sequence[float] = (50, 90, 99)
+                  ) -> Dict[str, float]:
+    """
+    Compute summary statistics over a list or array of floats.
+
+    With NumPy the values are viewed as a float64 vector and reduced with
+    numpy.sum, min, max and percentile. Without it, the built-in sum, min
+    and max make one pass each, and only the percentiles need a sorted
+    (boxed) copy of the values, so passing percentiles=() keeps the memory
+    saving of an array. A list and an array holding the same values give
+    identical results either way.
+
+    Args:
+        values: The values, as a list, array('d') or NumPy array.
+        percentiles: The percentiles to compute, between 0 and 100, with
+        linear interpolation.
+
+    Returns:
+        dict: count, sum, mean, min, max and one p<percentile> entry per
+        percentile, such as p50 (only count when values is empty).
+    """
+    count = len(values)
+    if count == 0:
+        return {"count": 0}
+    if numpy is not None:
+        vector = numpy.asarray(values, dtype=numpy.float64)
+        total = float(numpy.sum(vector))
+        low, high = float(numpy.min(vector)), float(numpy.max(vector))
+        quantiles = [float(value) for value in
+                     numpy.percentile(vector, percentiles)]
+    else:
+        total, low, high = float(sum(values)), min(values), max(values)
+        ordered = sorted(values) if percentiles else []
+        quantiles = [_percentile(ordered, percentile / 100)
+                     for percentile in percentiles]
+
+    stats = {"count": count, "sum": total, "mean": total / count,
+             "min": low, "max": high}
+    for percentile, value in zip(percentiles, quantiles):
+        stats["p{:g}".format(percentile)] = value
+    return stats
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+
+batched = __import__('5-batched_comprehension')
+
+
+async def numbers(n):
+    for _ in range(n):
+        yield random.uniform(0, 10)
+
+
+async def collect_list(n):
+    return [value async for value in numbers(n)]
+
+
+async def main():
+    print(batched.reduce_values(await batched.async_comprehension_array()))
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    for name, collect in (
+            ("list", lambda: collect_list(n)),
+            ("array", lambda: batched.async_comprehension_array(
+                numbers(n)))):
+        random.seed(0)
+        start = time.perf_counter()
+        values = await collect()
+        collected = time.perf_counter()
+        stats = batched.reduce_values(values)
+        reduced = time.perf_counter()
+        batched.reduce_values(values, percentiles=())
+        unsorted = time.perf_counter()
+        del values
+        random.seed(0)
+        tracemalloc.start()
+        values = await collect()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del values
+        print("{:<6} collect {:.3f} s ({:.1f} MB), reduce {:.3f} s, "
+              "without percentiles {:.3f} s, sum {!r}".format(
+                  name, collected - start, retained / 1e6,
+                  reduced - collected, unsorted - reduced, stats["sum"]))
+
+asyncio.run(main())
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+
+import asyncio
+
+safe_generator = __import__('6-safe_generator')
+
+
+async def main():
+    async for value in safe_generator.guarded(item_timeout=2):
+        print(value)
+        break
+
+    try:
+        async for value in safe_generator.guarded(item_timeout=0.5):
+            print(value)
+    except asyncio.TimeoutError:
+        print("TimeoutError raised when an item takes too long")
+
+    print(await safe_generator.measure_runtime_bounded(timeout=3))
+    print(safe_generator.metrics.snapshot())
+
+asyncio.run(main())
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Module for cancellation- and timeout-aware async generator consumption.
+
+guarded() wraps an async generator such as async_generator() with per-item
+timeouts and an overall deadline, and always closes the wrapped generator,
+including when the consumer abandons the stream or is cancelled. closing()
+gives the same guarantee as an async context manager, and
+gather_with_timeout() bounds a gather such as measure_runtime's so one
+stuck producer cannot stall the others. Outcomes are counted in
+StreamMetrics.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional
+async_generator = __import__('0-async_generator').async_generator
+
+
+class StreamMetrics:
+    """Counters of how guarded streams ended."""
+
+    def __init__(self) -> None:
+        """Start with every counter at zero."""
+        self.started = 0
+        self.completed = 0
+        self.abandoned = 0
+        self.timed_out = 0
+        self.failed = 0
+
+    @property
+    def active(self) -> int:
+        """Return the number of streams that have not ended yet."""
+        return self.started - (self.completed + self.abandoned +
+                               self.timed_out + self.failed)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return the counters as a dict."""
+        return {
+            "started": self.started,
+            "active": self.active,
+            "completed": self.completed,
+            "abandoned": self.abandoned,
+            "timed_out": self.timed_out,
+            "failed": self.failed,
+        }
+
+
+metrics = StreamMetrics()
+# Set by gather_with_timeout before it cancels the tasks it started (which
+# inherit it), so guarded() counts those streams as timed out.
+_group_timed_out: ContextVar[Optional[asyncio.Event]] = ContextVar(
+    "_group_timed_out", default=None)
+
+
+async def _shielded_close(stream: Any) -> None:
+    """Close stream, finishing the cleanup even if the caller is cancelled."""
+    aclose = getattr(stream, "aclose", None)
+    if aclose is not None:
+        await asyncio.shield(aclose())
+
+
+async def guarded(stream: Optional[AsyncIterator] = None,
+                  item_timeout: Optional[float] = None,
+                  deadline: Optional[float] = None,
+                  stream_metrics: Optional[StreamMetrics] = None
+                  ) -> AsyncIterator[Any]:
+    """
+    Yield the items of an async generator under timeouts.
+
+    Waiting longer than item_timeout for one item, or past deadline seconds
+    for the whole stream, raises asyncio.TimeoutError. Whatever the outcome
+    (exhaustion, timeout, error, consumer closing or cancellation) the
+    wrapped generator is closed, and the outcome is counted. A stream
+    cancelled because an enclosing gather_with_timeout() ran out of time
+    counts as timed out rather than abandoned.
+
+    Args:
+        stream: The async generator to consume, defaults to
+        async_generator().
+        item_timeout: Optional maximum wait for each item, in seconds.
+        deadline: Optional maximum duration of the whole stream.
+        stream_metrics: Counters to update, defaults to module metrics.
+
+    Yields:
+        The items of stream.
+
+    Example:
+        >>> async for value in guarded(async_generator(), item_timeout=2):
+        ...     print(value)
+    """
+    stream = stream or async_generator()
+    counters = stream_metrics or metrics
+    end = None if deadline is None else time.monotonic() + deadline
+    group_timed_out = _group_timed_out.get()
+    counters.started += 1
+    outcome = "abandoned"
+    try:
+        while True:
+            timeout = item_timeout
+            if end is not None:
+                remaining = max(0.0, end - time.monotonic())
+                timeout = (remaining if timeout is None
+                           else min(timeout, remaining))
+            try:
+                item = await asyncio.wait_for(stream.__anext__(), timeout)
+            except StopAsyncIteration:
+                outcome = "completed"
+                return
+            except asyncio.TimeoutError:
+                outcome = "timed_out"
+                raise
+            except Exception:
+                outcome = "failed"
+                raise
+            yield item
+    finally:
+        if (outcome == "abandoned" and group_timed_out is not None and
+                group_timed_out.is_set()):
+            outcome = "timed_out"
+        setattr(counters, outcome, getattr(counters, outcome) + 1)
+        await _shielded_close(stream)
+
+
+@asynccontextmanager
+async def closing(stream: Optional[AsyncIterator] = None
+                  ) -> AsyncIterator[AsyncIterator]:
+    """
+    Guarantee that an async generator is closed when the block exits.
+
+    Example:
+        >>> async with closing(async_generator()) as stream:
+        ...     async for value in stream:
+        ...         break
+    """
+    stream = stream or async_generator()
+    try:
+        yield stream
+    finally:
+        await _shielded_close(stream)
+
+
+async def gather_with_timeout(*aws: Awaitable,
+                              timeout: Optional[float] = None
+                              ) -> List[Optional[Any]]:
+    """
+    Await several awaitables concurrently, giving up after timeout.
+
+    Awaitables still pending at the timeout are cancelled and awaited so
+    that their cleanup runs; their slot in the result is None. guarded()
+    streams they were consuming are counted as timed out.
+
+    Args:
+        *aws: The awaitables to run.
+        timeout: Optional timeout in seconds for the whole group.
+
+    Returns:
+        list: The results in argument order, None for cancelled ones.
+    """
+    timed_out = asyncio.Event()
+    token = _group_timed_out.set(timed_out)
+    try:
+        tasks = [asyncio.ensure_future(aw) for aw in aws]
+    finally:
+        _group_timed_out.reset(token)
+    if not tasks:
+        return []
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            timed_out.set()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [None if task in pending else task.result() for task in tasks]
+
+
+async def measure_runtime_bounded(timeout: float = 15.0,
+                                  item_timeout: Optional[float] = None
+                                  ) -> float:
+    """
+    Measure four concurrent guarded comprehensions, like measure_runtime,
+    but never for longer than timeout seconds.
+
+    Args:
+        timeout: Maximum duration of the measurement.
+        item_timeout: Optional maximum wait for each generated value.
+
+    Returns:
+        float: The runtime in seconds.
+    """
+    async def comprehension() -> List[float]:
+        """Collect one guarded async_generator."""
+        return [value async for value in guarded(
+            async_generator(), item_timeout=item_timeout)]
+
+    start_time = time.perf_counter()
+    await gather_with_timeout(*(comprehension() for _ in range(4)),
+                              timeout=timeout)
+    end_time = time.perf_counter()
+
+    return end_time - start_time
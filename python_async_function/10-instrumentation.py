@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Module providing event-loop instrumentation for the async helpers.
+
+An Instrumentation records, per instrumented coroutine or async generator,
+how many are pending and how many finished (by outcome), a histogram of
+their lifetimes, a histogram of event-loop lag sampled in the background
+and the callbacks that blocked the loop for too long. Snapshots export as
+JSON or Prometheus text. When disabled, instrumented functions return the
+original coroutine after a single attribute check.
+"""
+import asyncio
+import bisect
+import inspect
+import json
+import logging
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import wraps
+from asyncio.log import logger as async_logger
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Tuple
+
+concurrent_coroutines = __import__('1-concurrent_coroutines')
+tasks = __import__('3-tasks')
+
+SLOW_CALLBACK_MESSAGE = 'Executing %s took %.3f seconds'
+_session_loops: "weakref.WeakSet[asyncio.AbstractEventLoop]" = \
+    weakref.WeakSet()
+
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0,
+           float('inf'))
+
+
+class Histogram:
+    """Cumulative-friendly histogram with fixed upper bounds."""
+
+    def __init__(self, bounds: Tuple[float, ...] = BUCKETS) -> None:
+        """Create an empty histogram over bounds."""
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return (upper bound, number of values <= bound) pairs."""
+        pairs, total = [], 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the histogram as a JSON-serializable dict."""
+        return {
+            "buckets": {("+Inf" if bound == float('inf') else str(bound)):
+                        count for bound, count in self.cumulative()},
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class _SlowCallbackFilter(logging.Filter):
+    """Capture the slow-callback warnings asyncio logs for one loop.
+
+    A debug-mode loop logs them from its own thread, right after running
+    the callback, so the loop running in the current thread tells which
+    loop a warning belongs to.
+    """
+
+    def __init__(self, collector: "Instrumentation",
+                 loop: asyncio.AbstractEventLoop, threshold: float,
+                 propagate: bool) -> None:
+        """Record warnings of loop lasting threshold seconds or more;
+        they are still logged only when propagate is True."""
+        super().__init__()
+        self.collector = collector
+        self.loop = loop
+        self.threshold = threshold
+        self.propagate = propagate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Record a slow callback of the loop, keep other records."""
+        if (record.msg != SLOW_CALLBACK_MESSAGE or
+                asyncio._get_running_loop() is not self.loop):
+            return True
+        callback, duration = record.args
+        if duration >= self.threshold:
+            self.collector.slow_callbacks += 1
+            self.collector.slow_callback_log.append((duration, callback))
+        return self.propagate
+
+
+class Instrumentation:
+    """Collector of task, lag and slow-callback metrics."""
+
+    def __init__(self, enabled: bool = False) -> None:
+        """Create a collector, disabled unless enabled is True."""
+        self.enabled = enabled
+        self.started: Dict[str, int] = {}
+        self.finished: Dict[Tuple[str, str], int] = {}
+        self.lifetimes: Dict[str, Histogram] = {}
+        self.lag = Histogram()
+        self.slow_callbacks = 0
+        self.slow_callback_log: Deque[Tuple[float, str]] = deque(maxlen=20)
+        self._patches: List[Tuple[Any, str, Any]] = []
+
+    def pending(self) -> Dict[str, int]:
+        """Return the number of started but unfinished calls, by name."""
+        done: Dict[str, int] = {}
+        for (name, _), count in self.finished.items():
+            done[name] = done.get(name, 0) + count
+        return {name: count - done.get(name, 0)
+                for name, count in self.started.items()}
+
+    def _begin(self, name: str) -> float:
+        """Count a started call and return its start time."""
+        self.started[name] = self.started.get(name, 0) + 1
+        return time.perf_counter()
+
+    def _end(self, name: str, outcome: str, start: float) -> None:
+        """Count a finished call and record its lifetime."""
+        key = (name, outcome)
+        self.finished[key] = self.finished.get(key, 0) + 1
+        histogram = self.lifetimes.setdefault(name, Histogram())
+        histogram.observe(time.perf_counter() - start)
+
+    async def _track(self, name: str, coroutine: Any) -> Any:
+        """Await coroutine while recording its lifetime and outcome."""
+        start = self._begin(name)
+        outcome = "error"
+        try:
+            result = await coroutine
+            outcome = "ok"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            self._end(name, outcome, start)
+
+    async def _track_generator(self, name: str,
+                               generator: Any) -> AsyncIterator:
+        """Iterate generator while recording its lifetime and outcome."""
+        start = self._begin(name)
+        outcome = "error"
+        try:
+            async for item in generator:
+                yield item
+            outcome = "ok"
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            raise
+        finally:
+            self._end(name, outcome, start)
+            await generator.aclose()
+
+    def instrument(self, function: Callable) -> Callable:
+        """
+        Decorate a coroutine or async generator function.
+
+        The decorated function is a plain function returning the original
+        coroutine or generator when the collector is disabled, and a
+        tracking wrapper around it when enabled.
+        """
+        name = function.__name__
+        track = (self._track_generator if inspect.isasyncgenfunction(function)
+                 else self._track)
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            """Return the (possibly tracked) coroutine or generator."""
+            if not self.enabled:
+                return function(*args, **kwargs)
+            return track(name, function(*args, **kwargs))
+
+        return wrapper
+
+    def patch(self, module: Any, attribute: str) -> None:
+        """Replace module.attribute by its instrumented version."""
+        original = getattr(module, attribute)
+        self._patches.append((module, attribute, original))
+        setattr(module, attribute, self.instrument(original))
+
+    def restore(self) -> None:
+        """Undo every patch, most recent first."""
+        while self._patches:
+            module, attribute, original = self._patches.pop()
+            setattr(module, attribute, original)
+
+    async def _sample_lag(self, interval: float) -> None:
+        """Record how late the loop wakes up a sleep of interval seconds."""
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(interval)
+            self.lag.observe(max(0.0, loop.time() - before - interval))
+
+    @asynccontextmanager
+    async def session(self, lag_interval: float = 0.01,
+                      slow_callback: float = 0.05) -> AsyncIterator:
+        """
+        Enable the collector for the duration of an async with block.
+
+        A background task samples loop lag every lag_interval seconds, and
+        callbacks (including task steps) of the running loop lasting
+        slow_callback seconds or more are counted. They are detected with
+        the loop's own debug mode, whose slow_callback_duration warnings
+        are captured for this loop only. asyncio's debug checks slow the
+        loop down while the session lasts. Both are removed when the block
+        exits, and only one session may run per loop at a time.
+        """
+        loop = asyncio.get_running_loop()
+        if loop in _session_loops:
+            raise RuntimeError("an instrumentation session is already "
+                               "running on this loop")
+        _session_loops.add(loop)
+        debug, duration = loop.get_debug(), loop.slow_callback_duration
+        capture = _SlowCallbackFilter(self, loop, slow_callback,
+                                      propagate=debug)
+        async_logger.addFilter(capture)
+        loop.slow_callback_duration = (min(duration, slow_callback)
+                                       if debug else slow_callback)
+        loop.set_debug(True)
+        self.enabled = True
+        sampler = asyncio.ensure_future(self._sample_lag(lag_interval))
+        try:
+            # The loop times a callback only if it was in debug mode when
+            # the callback started: start the block in a new step.
+            await asyncio.sleep(0)
+            yield self
+        finally:
+            sampler.cancel()
+            await asyncio.gather(sampler, return_exceptions=True)
+            self.enabled = False
+            loop.set_debug(debug)
+            # Likewise, this step is still timed: end it before leaving.
+            await asyncio.sleep(0)
+            loop.slow_callback_duration = duration
+            async_logger.removeFilter(capture)
+            _session_loops.discard(loop)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return every metric as a JSON-serializable dict."""
+        finished: Dict[str, Dict[str, int]] = {}
+        for (name, outcome), count in self.finished.items():
+            finished.setdefault(name, {})[outcome] = count
+        return {
+            "started": dict(self.started),
+            "pending": self.pending(),
+            "finished": finished,
+            "lifetime_seconds": {name: histogram.to_dict()
+                                 for name, histogram in
+                                 self.lifetimes.items()},
+            "loop_lag_seconds": self.lag.to_dict(),
+            "slow_callbacks": self.slow_callbacks,
+            "slow_callback_log": [{"seconds": seconds, "callback": callback}
+                                  for seconds, callback in
+                                  self.slow_callback_log],
+        }
+
+    def to_json(self) -> str:
+        """Return the snapshot as JSON."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = ["# TYPE async_calls_started_total counter"]
+        for name, count in self.started.items():
+            lines.append(f'async_calls_started_total{{name="{name}"}} '
+                         f'{count}')
+        lines.append("# TYPE async_calls_pending gauge")
+        for name, count in self.pending().items():
+            lines.append(f'async_calls_pending{{name="{name}"}} {count}')
+        lines.append("# TYPE async_calls_finished_total counter")
+        for (name, outcome), count in self.finished.items():
+            lines.append(f'async_calls_finished_total{{name="{name}",'
+                         f'outcome="{outcome}"}} {count}')
+        lines.append("# TYPE async_call_lifetime_seconds histogram")
+        for name, histogram in self.lifetimes.items():
+            lines.extend(_histogram_lines("async_call_lifetime_seconds",
+                                          histogram, f'name="{name}",'))
+        lines.append("# TYPE event_loop_lag_seconds histogram")
+        lines.extend(_histogram_lines("event_loop_lag_seconds", self.lag))
+        lines.append("# TYPE event_loop_slow_callbacks_total counter")
+        lines.append(f"event_loop_slow_callbacks_total {self.slow_callbacks}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(metric: str, histogram: Histogram,
+                     labels: str = "") -> List[str]:
+    """Return the Prometheus bucket, sum and count lines of a histogram."""
+    lines = []
+    for bound, count in histogram.cumulative():
+        upper = "+Inf" if bound == float('inf') else repr(bound)
+        lines.append(f'{metric}_bucket{{{labels}le="{upper}"}} {count}')
+    suffix = f"{{{labels.rstrip(',')}}}" if labels else ""
+    lines.append(f"{metric}_sum{suffix} {histogram.sum}")
+    lines.append(f"{metric}_count{suffix} {histogram.count}")
+
+    return lines
+
+
+instrumentation = Instrumentation()
+
+
+def install(collector: Instrumentation = instrumentation) -> None:
+    """
+    Instrument wait_random as used by wait_n and task_wait_random.
+
+    The helper modules import wait_random by value, so the name is patched
+    in each of them; restore() undoes it.
+    """
+    collector.patch(concurrent_coroutines, 'wait_random')
+    collector.patch(tasks, 'wait_random')
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+
+instrumentation_module = __import__('10-instrumentation')
+wait_n = __import__('1-concurrent_coroutines').wait_n
+task_wait_n = __import__('4-tasks').task_wait_n
+
+instrumentation = instrumentation_module.instrumentation
+instrumentation_module.install()
+wait_n = instrumentation.instrument(wait_n)
+task_wait_n = instrumentation.instrument(task_wait_n)
+
+
+async def main():
+    async with instrumentation.session(slow_callback=0.05):
+        await wait_n(20, 3)
+        await task_wait_n(20, 3)
+        time.sleep(0.1)
+    print(instrumentation.to_prometheus())
+
+asyncio.run(main())
+instrumentation.restore()
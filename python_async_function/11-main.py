@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+
+import asyncio
+
+runner_module = __import__('11-resilient_runner')
+ResilientRunner = runner_module.ResilientRunner
+run_virtual = __import__('7-virtual_clock').run_virtual
+
+print(asyncio.run(runner_module.resilient_wait_n(5, 1)))
+print(asyncio.run(runner_module.resilient_task_wait_n(5, 1)))
+
+# 10 calls limited to 2 per second (burst of 2) take about 4 virtual
+# seconds more than their own delays.
+runner = ResilientRunner(rate=2, burst=2)
+delays, simulated, _ = run_virtual(
+    runner_module.resilient_wait_n(10, 1, runner), seed=0)
+print(delays, "{:.1f} simulated s".format(simulated))
+
+for name, report in runner_module.simulate(n=2000, seed=0).items():
+    print("{:<8} p50={p50:.2f}s p95={p95:.2f}s p99={p99:.2f}s "
+          "max={max:.2f}s hedges={hedges} failures={failures}".format(
+              name, **report))
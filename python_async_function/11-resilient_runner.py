@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""Module providing a rate-limited, retrying and hedging async runner.
+
+A ResilientRunner runs latency-bound calls such as wait_random under a
+token-bucket rate limit, retries failures with exponential backoff and
+full jitter, and hedges slow calls: once an attempt has been running for
+longer than the recent p95 latency, a duplicate is fired and the first
+result wins. resilient_wait_n and resilient_task_wait_n keep the wait_n
+contract (results in completion order), and simulate() compares the tail
+latency with and without hedging on the virtual-clock loop.
+"""
+import asyncio
+import random
+from collections import deque
+from typing import (Awaitable, Callable, Deque, Dict, List, Optional, Tuple,
+                    Type, TypeVar)
+
+wait_random = __import__('0-basic_async_syntax').wait_random
+task_wait_random = __import__('3-tasks').task_wait_random
+run_virtual = __import__('7-virtual_clock').run_virtual
+
+T = TypeVar('T')
+
+
+class TokenBucket:
+    """Token bucket allowing rate calls per second, in bursts of capacity.
+
+    Waiting callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        """Create a full bucket refilled with rate tokens per second."""
+        assert rate > 0 and capacity >= 1, "rate and capacity too small"
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update."""
+        if self.updated is not None:
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None:
+            # Created here so that it belongs to the running loop.
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill(loop.time())
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill(loop.time())
+            self.tokens -= 1
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Return the delay before retry number attempt (0 for the first retry).
+
+    Full jitter: a uniform draw between 0 and min(cap, base * 2 ** attempt),
+    which spreads retries of many failing callers over time.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies with cached quantiles."""
+
+    def __init__(self, window: int = 1000, refresh: int = 16) -> None:
+        """Keep the last window latencies, re-sorting every refresh."""
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.refresh = refresh
+        self._sorted: List[float] = []
+        self._stale = 0
+
+    def record(self, latency: float) -> None:
+        """Add one latency."""
+        self.samples.append(latency)
+        self._stale += 1
+
+    def quantile(self, q: float, min_samples: int = 20) -> Optional[float]:
+        """Return the q quantile, or None with fewer than min_samples."""
+        if len(self.samples) < min_samples:
+            return None
+        if self._stale >= self.refresh or not self._sorted:
+            self._sorted = sorted(self.samples)
+            self._stale = 0
+        index = min(len(self._sorted) - 1, int(q * len(self._sorted)))
+        return self._sorted[index]
+
+
+class ResilientRunner:
+    """Run awaitable factories with rate limiting, retries and hedging."""
+
+    def __init__(self, rate: Optional[float] = None, burst: float = 1.0,
+                 retries: int = 3, base_delay: float = 0.1,
+                 max_backoff: float = 5.0,
+                 retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+                 hedge_quantile: Optional[float] = 0.95,
+                 hedge_after: Optional[float] = None,
+                 min_samples: int = 20) -> None:
+        """
+        Configure the runner.
+
+        Args:
+            rate: Optional calls per second allowed, hedges included.
+            burst: Token bucket capacity.
+            retries: Maximum number of retries after the first attempt.
+            base_delay: Backoff of the first retry, doubled every retry.
+            max_backoff: Maximum backoff.
+            retry_on: Exception types that are retried.
+            hedge_quantile: Latency quantile after which a duplicate is
+            fired, None to disable hedging.
+            hedge_after: Optional fixed hedging threshold in seconds,
+            replacing the measured quantile.
+            min_samples: Successful attempts observed before hedging on
+            the measured quantile.
+        """
+        self.bucket = None if rate is None else TokenBucket(rate, burst)
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+        self.hedge_quantile = hedge_quantile
+        self.hedge_after = hedge_after
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker()
+        self.stats: Dict[str, int] = dict.fromkeys(
+            ("calls", "attempts", "retries", "hedges", "hedge_wins",
+             "failures"), 0)
+
+    def hedge_threshold(self) -> Optional[float]:
+        """Return how long an attempt may run before being hedged."""
+        if self.hedge_after is not None:
+            return self.hedge_after
+        if self.hedge_quantile is None:
+            return None
+        return self.latencies.quantile(self.hedge_quantile, self.min_samples)
+
+    async def _attempt(self, factory: Callable[[], Awaitable[T]],
+                       primary: bool = False) -> T:
+        """
+        Run one rate-limited attempt, recording its latency.
+
+        A cancelled primary attempt, typically one that lost to its hedge,
+        records the time it ran, a lower bound of its latency: leaving
+        these slow attempts out would lower the quantile, and with it the
+        threshold, every time a call is hedged. Cancelled hedges started
+        late and are not recorded.
+        """
+        if self.bucket is not None:
+            await self.bucket.acquire()
+        loop = asyncio.get_running_loop()
+        self.stats["attempts"] += 1
+        start = loop.time()
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            if primary:
+                self.latencies.record(loop.time() - start)
+            raise
+        self.latencies.record(loop.time() - start)
+        return result
+
+    async def _hedged(self, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run an attempt, racing it against a duplicate if it is slow."""
+        primary = asyncio.ensure_future(self._attempt(factory, True))
+        threshold = self.hedge_threshold()
+        if threshold is None:
+            return await primary
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=threshold)
+            if done:
+                return primary.result()
+            self.stats["hedges"] += 1
+            hedge = asyncio.ensure_future(self._attempt(factory))
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.stats["hedge_wins"] += task is hedge
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(self, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run factory() until it succeeds or the retries are exhausted.
+
+        Args:
+            factory: Returns a new awaitable for every attempt.
+
+        Returns:
+            The first successful result.
+        """
+        self.stats["calls"] += 1
+        attempt = 0
+        while True:
+            try:
+                return await self._hedged(factory)
+            except self.retry_on:
+                if attempt == self.retries:
+                    self.stats["failures"] += 1
+                    raise
+            self.stats["retries"] += 1
+            await asyncio.sleep(backoff_delay(attempt, self.base_delay,
+                                              self.max_backoff))
+            attempt += 1
+
+
+async def resilient_wait_n(n: int, max_delay: int,
+                           runner: Optional[ResilientRunner] = None
+                           ) -> List[float]:
+    """
+    Run wait_random n times through runner, like wait_n.
+
+    Returns:
+        List of the delays in completion order.
+    """
+    runner = runner or ResilientRunner()
+    calls = [runner.call(lambda: wait_random(max_delay)) for _ in range(n)]
+    return [await future for future in asyncio.as_completed(calls)]
+
+
+async def resilient_task_wait_n(n: int, max_delay: int,
+                                runner: Optional[ResilientRunner] = None
+                                ) -> List[float]:
+    """
+    Run task_wait_random n times through runner, like task_wait_n.
+
+    Returns:
+        List of the delays in completion order.
+    """
+    runner = runner or ResilientRunner()
+    calls = [runner.call(lambda: task_wait_random(max_delay))
+             for _ in range(n)]
+    return [await future for future in asyncio.as_completed(calls)]
+
+
+async def flaky_call(max_delay: int, slow_probability: float = 0.05,
+                     slow_factor: int = 10,
+                     failure_probability: float = 0.05) -> float:
+    """
+    Simulated downstream call built on wait_random.
+
+    With slow_probability the call takes up to slow_factor times longer
+    (a straggler), and with failure_probability it fails after its delay.
+    """
+    slow = random.random() < slow_probability
+    delay = await wait_random(max_delay * slow_factor if slow else max_delay)
+    if random.random() < failure_probability:
+        raise ConnectionError("simulated failure")
+    return delay
+
+
+async def _latencies(n: int, max_delay: int, interval: float,
+                     runner: ResilientRunner) -> List[float]:
+    """Return the sorted end-to-end latencies of n flaky calls arriving
+    every interval seconds."""
+    loop = asyncio.get_running_loop()
+
+    async def timed_call(index: int) -> float:
+        """Return the latency of one call, inf if it failed."""
+        await asyncio.sleep(index * interval)
+        start = loop.time()
+        try:
+            await runner.call(lambda: flaky_call(max_delay))
+        except ConnectionError:
+            return float('inf')
+        return loop.time() - start
+
+    return sorted(await asyncio.gather(*map(timed_call, range(n))))
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Return the q quantile of sorted values."""
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def simulate(n: int = 2000, max_delay: int = 2, interval: float = 0.01,
+             seed: int = 0, **options: float) -> Dict[str, Dict[str, float]]:
+    """
+    Compare retries alone with retries plus hedging on simulated calls.
+
+    Both runs use the virtual-clock loop, so they take no real time and
+    the same seed gives the same latencies.
+
+    Args:
+        n: Number of concurrent calls per run.
+        max_delay: max_delay of the normal calls.
+        interval: Seconds between the starts of two calls.
+        seed: Seed of the random module.
+        options: Extra ResilientRunner arguments for both runs.
+
+    Returns:
+        Dict of p50, p95, p99, max latency and runner stats per run.
+    """
+    report = {}
+    for name, quantile in (("retries", None), ("hedged", 0.95)):
+        runner = ResilientRunner(hedge_quantile=quantile, base_delay=0.05,
+                                 **options)
+        ordered, _, _ = run_virtual(
+            _latencies(n, max_delay, interval, runner), seed)
+        report[name] = {"p50": _percentile(ordered, 0.50),
+                        "p95": _percentile(ordered, 0.95),
+                        "p99": _percentile(ordered, 0.99),
+                        "max": ordered[-1], **runner.stats}
+
+    return report
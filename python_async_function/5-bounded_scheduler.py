@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Module that runs many coroutines with a bounded number in flight.
+
+Instead of creating all n tasks up front like wait_n and task_wait_n, a
+fixed pool of workers pulls job indexes and streams results as they
+complete, so the number of live tasks and coroutines stays at the limit
+however large n grows.
+"""
+import asyncio
+from typing import (AsyncIterator, Awaitable, Callable, List, Optional,
+                    TypeVar)
+
+wait_random = __import__('0-basic_async_syntax').wait_random
+task_wait_random = __import__('3-tasks').task_wait_random
+
+T = TypeVar('T')
+_DONE = object()
+
+
+class _JobTimeout(Exception):
+    """Carries a TimeoutError raised by a job itself, not by its timeout."""
+
+
+async def bounded_as_completed(
+        factory: Callable[[int], Awaitable[T]], n: int, limit: int,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None) -> AsyncIterator[T]:
+    """
+    Run factory(0) ... factory(n - 1) with at most limit in flight.
+
+    Results are yielded in completion order. A job exceeding timeout is
+    cancelled and its result dropped; once deadline seconds have elapsed the
+    remaining jobs are cancelled and iteration stops. Any exception raised
+    by a job, including a TimeoutError of its own, cancels the remaining ones
+    and is re-raised. Leaving the
+    iteration early also cancels everything still running.
+
+    Args:
+        factory: Called with the job index, returns the awaitable to run.
+        n: Number of jobs.
+        limit: Maximum number of jobs in flight.
+        timeout: Optional per-job timeout in seconds.
+        deadline: Optional overall deadline in seconds.
+
+    Yields:
+        The job results, in completion order.
+    """
+    assert limit > 0, "limit must be positive"
+    loop = asyncio.get_running_loop()
+    end = None if deadline is None else loop.time() + deadline
+    indexes = iter(range(n))
+    # Bounded so that a slow consumer pauses the workers.
+    results: asyncio.Queue = asyncio.Queue(maxsize=limit)
+
+    async def run(index: int) -> T:
+        """Run one job, telling its own TimeoutError from wait_for's."""
+        try:
+            return await factory(index)
+        except asyncio.TimeoutError as error:
+            raise _JobTimeout() from error
+
+    async def worker() -> None:
+        """Run jobs until none are left, forwarding their outcome."""
+        for index in indexes:
+            try:
+                result = await asyncio.wait_for(run(index), timeout)
+            except _JobTimeout as error:
+                await results.put(error.__cause__)
+                return
+            except asyncio.TimeoutError:
+                continue
+            except Exception as error:
+                await results.put(error)
+                return
+            await results.put(result)
+        await results.put(_DONE)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(limit, n))]
+    running = len(workers)
+    try:
+        while running:
+            remaining = None if end is None else end - loop.time()
+            if remaining is not None and remaining <= 0:
+                return
+            try:
+                item = await asyncio.wait_for(results.get(), remaining)
+            except asyncio.TimeoutError:
+                return
+            if item is _DONE:
+                running -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def bounded_wait_n(n: int, max_delay: int, limit: int = 1000,
+                         timeout: Optional[float] = None,
+                         deadline: Optional[float] = None) -> List[float]:
+    """
+    Spawns wait_random n times with at most limit coroutines in flight.
+
+    Args:
+        n: Number of times to run wait_random.
+        max_delay: Maximum delay in seconds.
+        limit: Maximum number of wait_random in flight.
+        timeout: Optional per-call timeout, late calls are dropped.
+        deadline: Optional overall deadline, unfinished calls are dropped.
+
+    Returns:
+        List of the delays that completed, in completion order (which is
+        ascending when n <= limit).
+    """
+    return [delay async for delay in bounded_as_completed(
+        lambda _: wait_random(max_delay), n, limit, timeout, deadline)]
+
+
+async def bounded_task_wait_n(n: int, max_delay: int, limit: int = 1000,
+                              timeout: Optional[float] = None,
+                              deadline: Optional[float] = None
+                              ) -> List[float]:
+    """
+    Spawns task_wait_random n times with at most limit tasks alive.
+
+    Args:
+        n: Number of tasks to create.
+        max_delay: Maximum delay in seconds.
+        limit: Maximum number of tasks alive at once.
+        timeout: Optional per-task timeout, late tasks are cancelled.
+        deadline: Optional overall deadline, unfinished tasks are cancelled.
+
+    Returns:
+        List of the delays that completed, in completion order (which is
+        ascending when n <= limit).
+    """
+    return [delay async for delay in bounded_as_completed(
+        lambda _: task_wait_random(max_delay), n, limit, timeout, deadline)]
@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+
+import asyncio
+
+bounded_wait_n = __import__('5-bounded_scheduler').bounded_wait_n
+bounded_task_wait_n = __import__('5-bounded_scheduler').bounded_task_wait_n
+
+print(asyncio.run(bounded_wait_n(5, 5, limit=5)))
+print(asyncio.run(bounded_wait_n(10, 7, limit=3, timeout=5)))
+print(asyncio.run(bounded_task_wait_n(10, 7, limit=3, deadline=8)))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Module that collects awaitables in completion order without as_completed.
+
+asyncio.as_completed wraps every task in an extra future and hands them
+back one by one. Here each task gets a done callback writing its result
+into a preallocated list, and a single future is resolved once the last one
+lands, keeping the per-task cost to one callback.
+"""
+import asyncio
+from typing import Awaitable, Iterable, List, TypeVar
+
+wait_random = __import__('0-basic_async_syntax').wait_random
+task_wait_random = __import__('3-tasks').task_wait_random
+
+T = TypeVar('T')
+
+
+async def gather_completed(aws: Iterable[Awaitable[T]]) -> List[T]:
+    """
+    Await every awaitable and return their results in completion order.
+
+    Done callbacks run in the order tasks finish, so results are appended
+    in completion order. If one fails, or the caller is cancelled, the
+    tasks still running are cancelled and the error is propagated.
+
+    Args:
+        aws: Coroutines, tasks or futures to wait for.
+
+    Returns:
+        List of the results, in completion order.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    results: List = [None] * len(tasks)
+    if not tasks:
+        return results
+
+    finished = loop.create_future()
+    position = 0
+
+    def on_done(task: asyncio.Future) -> None:
+        """Store the outcome of one task in the next result slot."""
+        nonlocal position
+        error = (asyncio.CancelledError() if task.cancelled()
+                 else task.exception())
+        if finished.done():
+            return
+        if error is not None:
+            finished.set_exception(error)
+            return
+        results[position] = task.result()
+        position += 1
+        if position == len(results):
+            finished.set_result(None)
+
+    for task in tasks:
+        task.add_done_callback(on_done)
+    try:
+        await finished
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return results
+
+
+async def wait_n(n: int, max_delay: int) -> List[float]:
+    """
+    Spawns wait_random n times with the specified max_delay.
+
+    Args:
+        n: Number of times to spawn wait_random.
+        max_delay: Maximum delay in seconds.
+
+    Returns:
+        List of all the delays in ascending order.
+    """
+    return await gather_completed(wait_random(max_delay) for _ in range(n))
+
+
+async def task_wait_n(n: int, max_delay: int) -> List[float]:
+    """
+    Spawns task_wait_random n times with the specified max_delay.
+
+    Args:
+        n: Number of times to spawn task_wait_random.
+        max_delay: Maximum delay in seconds.
+
+    Returns:
+        List of all the delays in ascending order.
+    """
+    return await gather_completed(
+        task_wait_random(max_delay) for _ in range(n))
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Benchmark of as_completed collection against done-callback collection.
+
+Usage: ./6-main.py [max_exponent]   (n = 10 ... 10 ** max_exponent)
+"""
+import asyncio
+import sys
+import time
+
+wait_n = __import__('1-concurrent_coroutines').wait_n
+task_wait_n = __import__('4-tasks').task_wait_n
+collector = __import__('6-completion_collector')
+
+print(asyncio.run(collector.wait_n(5, 5)))
+print(asyncio.run(collector.task_wait_n(5, 5)))
+
+max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+implementations = {
+    "wait_n": wait_n,
+    "task_wait_n": task_wait_n,
+    "collector.wait_n": collector.wait_n,
+    "collector.task_wait_n": collector.task_wait_n,
+}
+for exponent in range(1, max_exponent + 1):
+    n = 10 ** exponent
+    for name, implementation in implementations.items():
+        start = time.perf_counter()
+        asyncio.run(implementation(n, 0))
+        elapsed = time.perf_counter() - start
+        print("n={:<8} {:<22} {:>9.4f} s {:>8.2f} us/task".format(
+            n, name, elapsed, elapsed / n * 1e6))
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+virtual_clock = __import__('7-virtual_clock')
+wait_n = __import__('1-concurrent_coroutines').wait_n
+
+print(virtual_clock.measure_time_virtual(5, 9, seed=42))
+print(virtual_clock.measure_time_virtual(5, 9, seed=42))
+print(virtual_clock.run_virtual(wait_n(10000, 10), seed=0)[1:])
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'python_async_comprehension'))
+measure_runtime = __import__('2-measure_runtime').measure_runtime
+measured, simulated, wall = virtual_clock.run_virtual(measure_runtime())
+print("measure_runtime: {} measured s, {} simulated s, {:.4f} real s".format(
+    measured, simulated, wall))
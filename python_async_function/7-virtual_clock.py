@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Module providing a virtual-time event loop for instant async benchmarks.
+
+The loop's clock only moves when nothing is ready to run: it then jumps
+straight to the next scheduled timer. asyncio.sleep therefore returns
+immediately in wall time while loop.time() still reports the simulated
+latency, which separates scheduling overhead from simulated delays.
+Pending I/O is not waited for, so it is only meant for sleep-driven code
+such as wait_random and async_generator.
+"""
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+wait_n = __import__('1-concurrent_coroutines').wait_n
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """Selector event loop whose clock advances to the next timer."""
+
+    def __init__(self) -> None:
+        """Create the loop with its virtual clock at 0."""
+        self._virtual_time = 0.0
+        super().__init__()
+
+    def time(self) -> float:
+        """Return the virtual time in seconds."""
+        return self._virtual_time
+
+    def _run_once(self) -> None:
+        """Jump to the earliest timer when idle, then run one iteration.
+
+        _ready and _scheduled are the BaseEventLoop queues of ready
+        callbacks and pending timers (a heap ordered by _when).
+        """
+        if not self._ready and self._scheduled and not self._stopping:
+            self._virtual_time = max(self._virtual_time,
+                                     self._scheduled[0]._when)
+        super()._run_once()
+
+
+def run_virtual(main: Awaitable, seed: Optional[int] = None
+                ) -> Tuple[Any, float, float]:
+    """
+    Run a coroutine to completion on a fresh virtual-clock loop.
+
+    Args:
+        main: The coroutine to run.
+        seed: Optional seed for the random module, for reproducible runs.
+
+    Returns:
+        Tuple of the coroutine result, the simulated (virtual) seconds and
+        the wall-clock seconds spent.
+    """
+    if seed is not None:
+        random.seed(seed)
+    loop = VirtualClockEventLoop()
+    asyncio.set_event_loop(loop)
+    try:
+        start_wall = time.perf_counter()
+        result = loop.run_until_complete(main)
+        wall = time.perf_counter() - start_wall
+        virtual = loop.time()
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+    return result, virtual, wall
+
+
+def measure_time_virtual(n: int, max_delay: int,
+                         seed: Optional[int] = None) -> Dict[str, float]:
+    """
+    Measure wait_n(n, max_delay) like measure_time, without sleeping.
+
+    Args:
+        n: Number of times to spawn wait_random.
+        max_delay: Maximum delay in seconds.
+        seed: Optional seed for reproducible delays.
+
+    Returns:
+        Dict with the simulated time per operation ('simulated') and the
+        real scheduling overhead per operation ('overhead').
+    """
+    _, virtual, wall = run_virtual(wait_n(n, max_delay), seed)
+
+    return {"simulated": virtual / n, "overhead": wall / n}
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Module profiling the async fan-out helpers with repeated measurements.
+
+Unlike measure_time, which reports a single (end - start) / n figure, each
+target is run after warmup runs for a number of repetitions on a fresh
+event loop. The report gives percentiles and a 95% confidence interval of
+the runtime, event-loop lag sampled during the runs, and for the wait_random
+fan-out a breakdown into task creation, scheduling delay and awaiting. It
+is printed as JSON so that runs can be compared across versions and
+event-loop implementations (asyncio, and uvloop when it is installed).
+
+Usage: ./8-runtime_profiler.py [--n N] [--max-delay D] [--repeat R]
+                               [--warmup W] [--comprehension]
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+wait_random = __import__('0-basic_async_syntax').wait_random
+wait_n = __import__('1-concurrent_coroutines').wait_n
+task_wait_n = __import__('4-tasks').task_wait_n
+
+# Two-sided 95% Student t critical values, the normal value is used beyond.
+T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447,
+        7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228, 15: 2.131, 20: 2.086,
+        30: 2.042}
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Return the linearly interpolated percentile of sorted samples."""
+    position = (len(ordered) - 1) * fraction
+    low, high = math.floor(position), math.ceil(position)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """
+    Describe a list of samples.
+
+    Args:
+        samples: The measured values.
+
+    Returns:
+        Dict with count, mean, stdev, min, p50, p90, p99, max and the
+        bounds of the 95% confidence interval of the mean.
+    """
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    mean = statistics.fmean(ordered)
+    stdev = statistics.stdev(ordered) if len(ordered) > 1 else 0.0
+    df = len(ordered) - 1
+    t = next((T_95[k] for k in sorted(T_95) if df <= k), 1.96)
+    margin = t * stdev / math.sqrt(len(ordered))
+
+    return {
+        "count": len(ordered),
+        "mean": mean,
+        "stdev": stdev,
+        "min": ordered[0],
+        "p50": percentile(ordered, 0.5),
+        "p90": percentile(ordered, 0.9),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1],
+        "ci95_low": mean - margin,
+        "ci95_high": mean + margin,
+    }
+
+
+async def sample_lag(interval: float, samples: List[float]) -> None:
+    """Record how late the loop wakes up a sleep of interval seconds."""
+    loop = asyncio.get_running_loop()
+    while True:
+        before = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - before - interval))
+
+
+async def fanout(n: int, max_delay: int) -> Dict[str, float]:
+    """
+    Run a wait_n-style fan-out of wait_random and time its phases.
+
+    Returns:
+        Dict with 'creation' (creating the n tasks), 'scheduling_mean' and
+        'scheduling_max' (delay between creating a task and its first step)
+        and 'awaiting' (collecting the results in completion order).
+    """
+    created = [0.0] * n
+    delays = [0.0] * n
+
+    async def probe(index: int) -> float:
+        """Record the scheduling delay of one task, then wait."""
+        delays[index] = time.perf_counter() - created[index]
+        return await wait_random(max_delay)
+
+    start = time.perf_counter()
+    tasks = []
+    for index in range(n):
+        created[index] = time.perf_counter()
+        tasks.append(asyncio.create_task(probe(index)))
+    created_at = time.perf_counter()
+    for future in asyncio.as_completed(tasks):
+        await future
+    end = time.perf_counter()
+
+    return {
+        "creation": created_at - start,
+        "scheduling_mean": statistics.fmean(delays) if n else 0.0,
+        "scheduling_max": max(delays, default=0.0),
+        "awaiting": end - created_at,
+    }
+
+
+def run_on(loop_factory: Callable[[], asyncio.AbstractEventLoop],
+           main: Awaitable) -> Any:
+    """Run a coroutine on a new loop built by loop_factory."""
+    loop = loop_factory()
+    try:
+        return loop.run_until_complete(main)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+async def timed(target: Callable[[], Awaitable], lag_interval: float,
+                lag: List[float]) -> Any:
+    """Await target() while sampling loop lag, return (seconds, result)."""
+    sampler = asyncio.ensure_future(sample_lag(lag_interval, lag))
+    start = time.perf_counter()
+    try:
+        result = await target()
+    finally:
+        elapsed = time.perf_counter() - start
+        sampler.cancel()
+
+    return elapsed, result
+
+
+def profile(target: Callable[[], Awaitable], n: int, repeat: int = 10,
+            warmup: int = 2,
+            loop_factory: Optional[Callable[[], Any]] = None,
+            lag_interval: float = 0.005) -> Dict[str, Any]:
+    """
+    Profile an async target over several runs.
+
+    Args:
+        target: Returns the coroutine to measure, called once per run.
+        n: Number of operations per run, used for per-operation times.
+        repeat: Number of measured runs.
+        warmup: Number of runs discarded before measuring.
+        loop_factory: Builds the event loop of every run.
+        lag_interval: Period of the loop lag sampler in seconds.
+
+    Returns:
+        Dict with the 'total', 'per_op' and 'lag' summaries, plus a
+        'breakdown' of summaries when target returns fanout() phases.
+    """
+    loop_factory = loop_factory or asyncio.new_event_loop
+    totals, lag = [], []
+    phases: Dict[str, List[float]] = {}
+    for run in range(warmup + repeat):
+        run_lag: List[float] = []
+        elapsed, result = run_on(loop_factory,
+                                 timed(target, lag_interval, run_lag))
+        if run < warmup:
+            continue
+        totals.append(elapsed)
+        lag.extend(run_lag)
+        if isinstance(result, dict):
+            for phase, seconds in result.items():
+                phases.setdefault(phase, []).append(seconds)
+
+    report = {
+        "total": summarize(totals),
+        "per_op": summarize([total / n for total in totals]),
+        "lag": summarize(lag),
+    }
+    if phases:
+        report["breakdown"] = {phase: summarize(samples)
+                               for phase, samples in phases.items()}
+
+    return report
+
+
+def loop_factories() -> Dict[str, Callable[[], Any]]:
+    """Return the available event-loop implementations by name."""
+    factories = {"asyncio": asyncio.new_event_loop}
+    try:
+        import uvloop
+    except ImportError:
+        return factories
+    factories["uvloop"] = uvloop.new_event_loop
+
+    return factories
+
+
+def profile_all(n: int, max_delay: int, repeat: int = 10, warmup: int = 2,
+                comprehension: bool = False) -> Dict[str, Any]:
+    """
+    Profile wait_n, task_wait_n and the wait_random fan-out on every
+    available event loop.
+
+    Args:
+        n: Number of wait_random per run.
+        max_delay: Maximum delay in seconds, 0 measures pure overhead.
+        repeat: Number of measured runs.
+        warmup: Number of runs discarded before measuring.
+        comprehension: Also profile measure_runtime from the sibling
+        python_async_comprehension directory (about 10 s per run).
+
+    Returns:
+        Dict ready to be serialized as JSON.
+    """
+    targets = {
+        "wait_n": (lambda: wait_n(n, max_delay), n),
+        "task_wait_n": (lambda: task_wait_n(n, max_delay), n),
+        "fanout": (lambda: fanout(n, max_delay), n),
+    }
+    if comprehension:
+        directory = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 '..', 'python_async_comprehension')
+        sys.path.insert(0, directory)
+        try:
+            measure_runtime = __import__('2-measure_runtime').measure_runtime
+        finally:
+            sys.path.remove(directory)
+        targets["measure_runtime"] = (measure_runtime, 4)
+
+    results = []
+    for loop_name, factory in loop_factories().items():
+        for target_name, (target, operations) in targets.items():
+            results.append({
+                "target": target_name,
+                "loop": loop_name,
+                "n": operations,
+                "max_delay": max_delay,
+                **profile(target, operations, repeat, warmup, factory),
+            })
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument("--max-delay", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--comprehension", action="store_true")
+    args = parser.parse_args()
+
+    print(json.dumps(profile_all(args.n, args.max_delay, args.repeat,
+                                 args.warmup, args.comprehension), indent=2))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+wait_n = __import__('1-concurrent_coroutines').wait_n
+sharded = __import__('9-sharded_executor')
+
+
+def burn(delay: float) -> float:
+    """CPU-bound post-processing of one delay."""
+    total = delay
+    for i in range(20000):
+        total = (total * 31 + i) % 1000003
+    return delay
+
+
+async def single(n: int) -> None:
+    [burn(delay) for delay in await wait_n(n, 0)]
+
+
+if __name__ == "__main__":
+    print(asyncio.run(sharded.sharded_wait_n(5, 5, workers=2)))
+    print(asyncio.run(sharded.sharded_task_wait_n(10, 7, workers=3)))
+
+    n = 4000
+    start = time.perf_counter()
+    asyncio.run(single(n))
+    print("1 loop: {:.0f} ops/s".format(n / (time.perf_counter() - start)))
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            asyncio.run(sharded.sharded_wait_n(workers, 0, workers, burn,
+                                               pool))
+            start = time.perf_counter()
+            asyncio.run(sharded.sharded_wait_n(n, 0, workers, burn, pool))
+            elapsed = time.perf_counter() - start
+        print("{} workers: {:.0f} ops/s".format(workers, n / elapsed))
+        workers *= 2
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Module that shards wait_n-style workloads across worker processes.
+
+A single event loop runs on one core, so CPU-bound work done after each
+wait_random completes cannot scale. Here the n operations are split into
+one shard per worker process, each running its own event loop, and the
+completion-ordered results of every shard are merged back in the parent.
+"""
+import asyncio
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import Callable, List, Optional, Tuple
+
+wait_random = __import__('0-basic_async_syntax').wait_random
+task_wait_random = __import__('3-tasks').task_wait_random
+
+
+async def _shard(count: int, max_delay: int, work: Optional[Callable],
+                 use_tasks: bool) -> List[Tuple[float, float]]:
+    """Run one shard, timestamping every result when it completes."""
+    if use_tasks:
+        tasks = [task_wait_random(max_delay) for _ in range(count)]
+    else:
+        tasks = [asyncio.create_task(wait_random(max_delay))
+                 for _ in range(count)]
+
+    results = []
+    for future in asyncio.as_completed(tasks):
+        value = await future
+        if work is not None:
+            value = work(value)
+        results.append((time.monotonic(), value))
+
+    return results
+
+
+def run_shard(count: int, max_delay: int, work: Optional[Callable] = None,
+              use_tasks: bool = False) -> List[Tuple[float, float]]:
+    """
+    Run a shard of wait_random on a new event loop in this process.
+
+    Args:
+        count: Number of wait_random in the shard.
+        max_delay: Maximum delay in seconds.
+        work: Optional picklable function applied to every delay as soon as
+        it completes, its return value replaces the delay.
+        use_tasks: Create the tasks with task_wait_random.
+
+    Returns:
+        List of (monotonic completion time, value), in completion order.
+    """
+    return asyncio.run(_shard(count, max_delay, work, use_tasks))
+
+
+def shard_sizes(n: int, shards: int) -> List[int]:
+    """Split n into shards near-equal positive sizes."""
+    shards = max(1, min(shards, n))
+    return [n // shards + (1 if i < n % shards else 0)
+            for i in range(shards)]
+
+
+async def sharded_wait_n(n: int, max_delay: int,
+                         workers: Optional[int] = None,
+                         work: Optional[Callable] = None,
+                         executor: Optional[ProcessPoolExecutor] = None,
+                         use_tasks: bool = False) -> List[float]:
+    """
+    Spawns wait_random n times across worker processes.
+
+    Without work, the delays are returned in ascending order, like
+    wait_n. With work, the results are merged by completion time, taken
+    from time.monotonic, which is system-wide on Linux; as the shards do
+    not start at exactly the same time, this order can differ slightly
+    from that of the delays.
+
+    Args:
+        n: Number of times to spawn wait_random.
+        max_delay: Maximum delay in seconds.
+        workers: Number of shards, defaults to the number of CPUs.
+        work: Optional picklable function applied in the worker to every
+        delay as soon as it completes.
+        executor: Optional process pool to reuse, one is created otherwise.
+        use_tasks: Create the tasks with task_wait_random.
+
+    Returns:
+        List of all the delays (or work results) in completion order.
+    """
+    if n <= 0:
+        return []
+    workers = workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        shards = await asyncio.gather(*(
+            loop.run_in_executor(pool, run_shard, size, max_delay, work,
+                                 use_tasks)
+            for size in shard_sizes(n, workers)
+        ))
+    finally:
+        if executor is None:
+            # A blocking join would stall the event loop; the pool reaps its
+            # processes in the background, dropping shards not started yet
+            # on error or cancellation.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # Shards start at slightly different times, so without work the delays
+    # themselves are merged, keeping wait_n's ascending order; work results
+    # may not be orderable and are merged on completion time alone.
+    key = itemgetter(0 if work is not None else 1)
+    return [value for _, value in heapq.merge(*shards, key=key)]
+
+
+async def sharded_task_wait_n(n: int, max_delay: int,
+                              workers: Optional[int] = None,
+                              work: Optional[Callable] = None,
+                              executor: Optional[ProcessPoolExecutor] = None
+                              ) -> List[float]:
+    """
+    Spawns task_wait_random n times across worker processes.
+
+    Args:
+        n: Number of times to spawn task_wait_random.
+        max_delay: Maximum delay in seconds.
+        workers: Number of shards, defaults to the number of CPUs.
+        work: Optional picklable function applied to every delay.
+        executor: Optional process pool to reuse.
+
+    Returns:
+        List of all the delays (or work results) in completion order.
+    """
+    return await sharded_wait_n(n, max_delay, workers, work, executor,
+                                use_tasks=True)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+import math
+import random
+import sys
+import time
+from array import array
+
+kernels = __import__('10-numeric_kernels')
+
+print(kernels.fast_sum([3.14, 1.11, 2.22]) == sum([3.14, 1.11, 2.22]))
+print(kernels.fast_sum([0.1] * 10, compensated=True))
+print(kernels.chunked_sum((0.1 for _ in range(10)), chunk_size=3))
+
+max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+for exponent in range(3, max_exponent + 1):
+    n = 10 ** exponent
+    random.seed(0)
+    values = [random.uniform(-1, 1) * 10 ** random.randint(-8, 8)
+              for _ in range(n)]
+    buffer = array('d', values)
+    exact = math.fsum(values)
+    for name, run in (
+            ("sum(list)", lambda: float(sum(values))),
+            ("fast_sum(array)", lambda: kernels.fast_sum(buffer)),
+            ("fast_sum(compensated)",
+             lambda: kernels.fast_sum(buffer, compensated=True)),
+            ("chunked_sum(generator)",
+             lambda: kernels.chunked_sum(iter(values)))):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        print("n=10^{} {:<24} {:>8.1f} Mvalues/s  error {:.3e}".format(
+            exponent, name, n / elapsed / 1e6, abs(result - exact)))
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import tempfile
+import time
+from array import array
+from multiprocessing import shared_memory
+
+parallel_sum = __import__('11-parallel_sum')
+
+if __name__ == "__main__":
+    n = 5 * 10 ** 6
+    random.seed(0)
+    values = array('d', (random.uniform(-1, 1) *
+                         10 ** random.randint(-8, 8) for _ in range(n)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "metrics.f64")
+        with open(path, "wb") as f:
+            values.tofile(f)
+
+        start = time.perf_counter()
+        print("stream     ", parallel_sum.stream_sum_file(path),
+              "{:.3f} s".format(time.perf_counter() - start))
+        for workers in (1, 2, 4):
+            start = time.perf_counter()
+            print("{} workers  ".format(workers),
+                  parallel_sum.parallel_sum_file(path, workers),
+                  "{:.3f} s".format(time.perf_counter() - start))
+
+    block = shared_memory.SharedMemory(create=True, size=len(values) * 8)
+    try:
+        block.buf[:len(values) * 8] = values.tobytes()
+        print("shared     ",
+              parallel_sum.parallel_sum_shared(block.name, n, 2))
+    finally:
+        block.close()
+        block.unlink()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Parallel and streaming reduction module.
+
+This module sums very large float64 inputs that are not Python lists: raw
+binary files (memory-mapped, never fully loaded) and shared-memory blocks.
+The input is cut into fixed-size chunks, independently of the number of
+workers, each chunk is reduced with fast_sum and the partial sums are
+combined in a correctly rounded way with math.fsum. The result is
+therefore identical whatever the worker count, and identical to the
+sequential streaming mode.
+"""
+
+import math
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+fast_sum = __import__('10-numeric_kernels').fast_sum
+
+ITEM_SIZE = 8
+CHUNK_VALUES = 1 << 20
+
+
+def chunk_ranges(count: int,
+                 chunk_values: int = CHUNK_VALUES) -> List[Tuple[int, int]]:
+    """
+    Split count values into fixed-size (start, stop) value ranges.
+
+    Args:
+        count (int): Total number of values
+        chunk_values (int): Number of values per chunk
+
+    Returns:
+        List[Tuple[int, int]]: The ranges, in order
+
+    Examples:
+        >>> chunk_ranges(5, 2)
+        [(0, 2), (2, 4), (4, 5)]
+    """
+    assert chunk_values > 0, "chunk_values must be positive"
+    return [(start, min(start + chunk_values, count))
+            for start in range(0, count, chunk_values)]
+
+
+def _value_count(path: str) -> int:
+    """Return the number of float64 values stored in a binary file."""
+    size = os.path.getsize(path)
+    assert size % ITEM_SIZE == 0, "file size is not a multiple of 8 bytes"
+    return size // ITEM_SIZE
+
+
+def _sum_file_range(path: str, start: int, stop: int,
+                    compensated: bool) -> float:
+    """Sum the values [start, stop) of a float64 file through mmap."""
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)[start * ITEM_SIZE:stop * ITEM_SIZE]
+        values = view.cast('d')
+        try:
+            return fast_sum(values, compensated)
+        finally:
+            values.release()
+            view.release()
+
+
+def _sum_shared_range(name: str, start: int, stop: int,
+                      compensated: bool) -> float:
+    """Sum the values [start, stop) of a float64 shared-memory block."""
+    block = shared_memory.SharedMemory(name=name)
+    view = block.buf[start * ITEM_SIZE:stop * ITEM_SIZE]
+    values = view.cast('d')
+    try:
+        return fast_sum(values, compensated)
+    finally:
+        values.release()
+        view.release()
+        block.close()
+
+
+def parallel_sum_file(path: str, workers: Optional[int] = None,
+                      chunk_values: int = CHUNK_VALUES,
+                      compensated: bool = False) -> float:
+    """
+    Sum a raw little-endian float64 file across a process pool.
+
+    Args:
+        path (str): Path of the binary file (e.g. written by array.tofile)
+        workers (Optional[int]): Number of processes, defaults to CPUs
+        chunk_values (int): Number of values reduced per task
+        compensated (bool): Reduce each chunk with math.fsum
+
+    Returns:
+        float: The sum of all values, independent of workers
+    """
+    ranges = chunk_ranges(_value_count(path), chunk_values)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_sum_file_range, path, start, stop,
+                                   compensated)
+                   for start, stop in ranges]
+        return math.fsum(future.result() for future in futures)
+
+
+def parallel_sum_shared(name: str, count: int,
+                        workers: Optional[int] = None,
+                        chunk_values: int = CHUNK_VALUES,
+                        compensated: bool = False) -> float:
+    """
+    Sum count float64 values held in a named shared-memory block.
+
+    Args:
+        name (str): Name of the multiprocessing.shared_memory block
+        count (int): Number of values in the block
+        workers (Optional[int]): Number of processes, defaults to CPUs
+        chunk_values (int): Number of values reduced per task
+        compensated (bool): Reduce each chunk with math.fsum
+
+    Returns:
+        float: The sum of all values, independent of workers
+    """
+    ranges = chunk_ranges(count, chunk_values)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_sum_shared_range, name, start, stop,
+                                   compensated)
+                   for start, stop in ranges]
+        return math.fsum(future.result() for future in futures)
+
+
+def stream_sum_file(path: str, chunk_values: int = CHUNK_VALUES,
+                    compensated: bool = False) -> float:
+    """
+    Sum a raw float64 file sequentially with one reusable chunk buffer.
+
+    Memory use is one chunk whatever the file size, and the chunking is
+    the same as in parallel_sum_file, so both return the same value.
+
+    Args:
+        path (str): Path of the binary file
+        chunk_values (int): Number of values read per chunk
+        compensated (bool): Reduce each chunk with math.fsum
+
+    Returns:
+        float: The sum of all values
+    """
+    assert chunk_values > 0, "chunk_values must be positive"
+    _value_count(path)
+    buffer = bytearray(chunk_values * ITEM_SIZE)
+    partials = []
+    with open(path, "rb", buffering=0) as f, memoryview(buffer) as whole:
+        while True:
+            size = 0
+            while size < len(buffer):
+                read = f.readinto(whole[size:])
+                if not read:
+                    break
+                size += read
+            if not size:
+                break
+            with whole[:size] as view, view.cast('d') as values:
+                partials.append(fast_sum(values, compensated))
+
+    return math.fsum(partials)
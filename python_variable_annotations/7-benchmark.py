@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+import tracemalloc
+from array import array
+
+to_kv = __import__('7-to_kv').to_kv
+to_kv_batch = __import__('7-to_kv').to_kv_batch
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+keys = ["key{}".format(i) for i in range(n)]
+values = [i * 0.5 for i in range(n)]
+buffer = array('d', values)
+
+for name, run in (
+        ("to_kv loop", lambda: [to_kv(k, v) for k, v in zip(keys, values)]),
+        ("to_kv_batch(list)", lambda: to_kv_batch(keys, values)),
+        ("to_kv_batch(array)", lambda: to_kv_batch(keys, buffer))):
+    tracemalloc.start()
+    result = run()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print("{:<20} {:>7.1f} ns/pair {:>6.1f} bytes/pair".format(
+        name, elapsed / n * 1e9, retained / n))
+    del result
+
+batch = to_kv_batch(keys, values)
+print(list(batch.pairs()) == [to_kv(k, v) for k, v in zip(keys, values)])
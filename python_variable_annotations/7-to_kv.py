@@ -3,10 +3,33 @@
 Key-value transformation module.
 
 This module provides utility functions for creating and transforming key-value
-pairs, with specific numeric operations applied to the values.
+pairs, with specific numeric operations applied to the values, either one
+pair at a time or for whole columns of keys and values at once.
 """
 
-from typing import Union, Tuple
+from array import array
+from operator import mul
+from typing import (Dict, Iterator, Mapping, Optional, Sequence, Tuple,
+                    Union)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _float_buffer(data: object) -> Optional[memoryview]:
+    """Return a float64 memoryview over data without copying it, or None
+    if data does not expose a contiguous float64 buffer."""
+    if type(data) is list:
+        return None
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return None
+    if view.format != 'd' or not view.c_contiguous:
+        return None
+    return view.cast('B').cast('d') if view.ndim != 1 else view
 
 
 def to_kv(k: str, v: Union[int, float]) -> Tuple[str, float]:
@@ -34,3 +57,80 @@ def to_kv(k: str, v: Union[int, float]) -> Tuple[str, float]:
         ('negative', 1.0)
     """
     return (k, float(v**2))
+
+
+class KVColumns(Mapping):
+    """
+    Columnar result of to_kv_batch: a list of keys and an array('d') of
+    squared values, also usable as a read-only mapping.
+
+    The mapping index is only built when first needed, by a lookup,
+    len() or iteration, and then reused. When a key is repeated, the
+    mapping returns its last value while the columns keep every pair.
+    """
+
+    def __init__(self, keys: Sequence[str], values: array):
+        """Wrap the key and value columns, which must have equal lengths."""
+        assert len(keys) == len(values), "keys and values lengths differ"
+        self.keys_column = keys
+        self.values_column = values
+        self._index: Optional[Dict[str, int]] = None
+
+    def _positions(self) -> Dict[str, int]:
+        """Return the index of key positions, building it once."""
+        if self._index is None:
+            self._index = {k: i for i, k in enumerate(self.keys_column)}
+        return self._index
+
+    def __getitem__(self, key: str) -> float:
+        """Return the squared value of key."""
+        return self.values_column[self._positions()[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the distinct keys in column order."""
+        return iter(self._positions())
+
+    def __len__(self) -> int:
+        """Return the number of distinct keys."""
+        return len(self._positions())
+
+    def pairs(self) -> Iterator[Tuple[str, float]]:
+        """Iterate over the (key, squared value) tuples to_kv would build."""
+        return zip(self.keys_column, self.values_column)
+
+
+def to_kv_batch(keys: Sequence[str],
+                values: Sequence[Union[int, float]]) -> KVColumns:
+    """
+    Square a whole column of values at once, like calling to_kv per pair.
+
+    Float64 buffers (array('d'), memoryviews, NumPy arrays) are squared in
+    one vectorized NumPy pass written straight into the result array when
+    NumPy is installed; other sequences are squared in a single C-level
+    map. The squared values equal those of to_kv.
+
+    Args:
+        keys (Sequence[str]): The string keys
+        values (Sequence[Union[int, float]]): The numeric values, same
+                                              length as keys
+
+    Returns:
+        KVColumns: The keys and an array('d') of the squared values
+
+    Examples:
+        >>> result = to_kv_batch(["eggs", "school"], [3, 0.5])
+        >>> list(result.pairs())
+        [('eggs', 9.0), ('school', 0.25)]
+        >>> result["eggs"]
+        9.0
+    """
+    assert len(keys) == len(values), "keys and values lengths differ"
+    view = _float_buffer(values)
+    if view is not None and numpy is not None:
+        squared = array('d', bytes(len(view) * 8))
+        numpy.square(numpy.frombuffer(view, dtype=numpy.float64),
+                     out=numpy.frombuffer(squared, dtype=numpy.float64))
+    else:
+        squared = array('d', map(mul, values, values))
+
+    return KVColumns(keys, squared)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+from array import array
+
+make_multiplier = __import__('8-make_multiplier').make_multiplier
+compose = __import__('8-make_multiplier').compose
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+readings = [i * 0.001 for i in range(n)]
+chain = [make_multiplier(1000.0), make_multiplier(0.001),
+         make_multiplier(3.6)]
+fused = compose(*chain)
+
+
+def stepwise():
+    values = readings
+    for multiplier in chain:
+        values = [multiplier(value) for value in values]
+    return values
+
+
+buffer = array('d', readings)
+for name, run in (("stepwise calls", stepwise),
+                  ("fused apply(list)", lambda: fused.apply(readings)),
+                  ("fused apply(array)", lambda: fused.apply(buffer)),
+                  ("fused in place", lambda: fused.apply(buffer, True))):
+    start = time.perf_counter()
+    run()
+    print("{:<20} {:>7.1f} ns/value".format(
+        name, (time.perf_counter() - start) / n * 1e9))
+
+expected = stepwise()
+result = fused.apply(readings)
+print(max(abs(a - b) for a, b in zip(expected, result)) < 1e-9)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+module = __import__('9-element_length')
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6
+    lines = ["x" * (i % 97) for i in range(n)]
+
+    for name, run in (
+            ("element_length", lambda: module.element_length(lines)),
+            ("element_lengths", lambda: module.element_lengths(lines)),
+            ("length_histogram", lambda: module.length_histogram(lines)),
+            ("iter_element_length",
+             lambda: sum(1 for _ in module.iter_element_length(lines)))):
+        tracemalloc.start()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("{:<20} {:>6.1f} ns/item {:>10} bytes peak".format(
+            name, elapsed / n * 1e9, peak))
+
+    with tempfile.NamedTemporaryFile('w', delete=False) as file:
+        file.write("\n".join(lines))
+    try:
+        expected = module.length_histogram(lines)
+        for workers in (1, os.cpu_count()):
+            start = time.perf_counter()
+            histogram = module.line_length_histogram(file.name, workers,
+                                                     chunk_bytes=1 << 20)
+            print("line_length_histogram workers={} {:.3f}s {}".format(
+                workers, time.perf_counter() - start, histogram == expected))
+    finally:
+        os.unlink(file.name)
@@ -4,10 +4,18 @@ Sequence analysis module.
 
 This module provides utility functions for analyzing sequences (like lists,
 strings, tuples) and extracting information about their structure and
-properties.
+properties. Besides the eager element_length, it offers a streaming
+variant, a compact length-only mode and constant-memory length histograms,
+including a parallel one over the lines of large files.
 """
 
-from typing import Sequence, List, Tuple, Iterable
+import os
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence, List, Tuple, Iterable, Iterator, Optional
+
+CHUNK_BYTES = 1 << 26
 
 
 def element_length(lst: Iterable[Sequence]) -> List[Tuple[Sequence, int]]:
@@ -37,3 +45,128 @@ def element_length(lst: Iterable[Sequence]) -> List[Tuple[Sequence, int]]:
         []
     """
     return [(i, len(i)) for i in lst]
+
+
+def iter_element_length(lst: Iterable[Sequence]
+                        ) -> Iterator[Tuple[Sequence, int]]:
+    """
+    Lazily yield each sequence with its length.
+
+    Unlike element_length, nothing is kept once a pair has been consumed,
+    so unbounded iterables and generators are fine.
+
+    Args:
+        lst (Iterable[Sequence]): Any iterable of sequence objects
+
+    Returns:
+        Iterator[Tuple[Sequence, int]]: The (sequence, length) pairs
+
+    Examples:
+        >>> list(iter_element_length(iter(["ab", "c"])))
+        [('ab', 2), ('c', 1)]
+    """
+    for item in lst:
+        yield item, len(item)
+
+
+def element_lengths(lst: Iterable[Sequence]) -> array:
+    """
+    Return only the lengths, packed into an array('q').
+
+    Each length takes 8 bytes and no reference to the sequences is kept.
+
+    Args:
+        lst (Iterable[Sequence]): Any iterable of sequence objects
+
+    Returns:
+        array: The lengths, as signed 64-bit integers
+
+    Examples:
+        >>> element_lengths(["hello", [1, 2], ()])
+        array('q', [5, 2, 0])
+    """
+    return array('q', map(len, lst))
+
+
+def length_histogram(lst: Iterable[Sequence]) -> Counter:
+    """
+    Count how many sequences have each length.
+
+    Memory only grows with the number of distinct lengths.
+
+    Args:
+        lst (Iterable[Sequence]): Any iterable of sequence objects
+
+    Returns:
+        Counter: Number of sequences per length
+
+    Examples:
+        >>> sorted(length_histogram(["a", "bc", "de"]).items())
+        [(1, 1), (2, 2)]
+    """
+    return Counter(map(len, lst))
+
+
+def _line_histogram_range(path: str, start: int, stop: int,
+                          encoding: Optional[str] = None) -> Counter:
+    """Histogram the lengths of the lines of path starting in
+    [start, stop)."""
+    histogram: Counter = Counter()
+    with open(path, 'rb') as file:
+        if start > 0:
+            # Skip the line that started in the previous range.
+            file.seek(start - 1)
+            file.readline()
+        position = file.tell()
+        for line in file:
+            if position >= stop:
+                break
+            position += len(line)
+            newline = line.endswith(b"\n")
+            if encoding is not None:
+                line = line.decode(encoding)
+            histogram[len(line) - newline] += 1
+
+    return histogram
+
+
+def line_length_histogram(path: str, workers: Optional[int] = None,
+                          chunk_bytes: int = CHUNK_BYTES,
+                          encoding: Optional[str] = None) -> Counter:
+    """
+    Histogram the line lengths of a file, in parallel and constant memory.
+
+    The file is split into byte ranges of about chunk_bytes, each handled
+    by a worker process that streams its lines and returns a small
+    Counter; the counters are then added. A line belongs to the range
+    where it starts, so the result does not depend on the split.
+
+    Args:
+        path (str): The file to read
+        workers (Optional[int]): Number of processes, 1 to stay in the
+                                 current process, None for the CPU count
+        chunk_bytes (int): Approximate size of each range, in bytes
+        encoding (Optional[str]): Count characters decoded with this
+                                  encoding instead of bytes
+
+    Returns:
+        Counter: Number of lines per length, the newline not included
+    """
+    assert chunk_bytes > 0, "chunk_bytes must be positive"
+    size = os.path.getsize(path)
+    ranges = [(start, min(start + chunk_bytes, size))
+              for start in range(0, size, chunk_bytes)]
+    histogram: Counter = Counter()
+    if workers == 1 or len(ranges) <= 1:
+        for start, stop in ranges:
+            histogram.update(_line_histogram_range(path, start, stop,
+                                                   encoding))
+        return histogram
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(_line_histogram_range, path, start, stop,
+                                   encoding) for start, stop in ranges]
+        for future in futures:
+            histogram.update(future.result())
+
+    return histogram